@@ -1,27 +1,41 @@
 import chess
 import chess.engine
-import chess.pgn
 import time
 import os
+import sys
 from datetime import datetime
 import json
-from collections import defaultdict
-import pandas as pd
-import numpy as np
-from tqdm import tqdm
+import csv
+import logging
 import random
-from movegeneration import next_move, debug_info
-from evaluate import evaluate_board
+from movegeneration import (next_move, debug_info, cached_evaluate,
+                            attach_shared_eval_table, detach_shared_eval_table)
+from evaluate import piece_values
 from game_learner import GameLearner
 import multiprocessing
-from functools import partial
+from multiprocessing import shared_memory
+from multiprocessing.util import Finalize
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # Optional faster JSON backend
+    orjson = None
 
 def integrate_with_batch_analysis(batch_match):
     """Integrate learning with the batch analysis system."""
     learner = GameLearner(experience_file="engine_analysis/learned_positions.json")
     
+    # Earlier batches are already in the experience file, so only this
+    # batch's games are learned, straight from their in-memory move lists
+    # rather than by parsing back the PGN that was just written
     print("\nLearning from played games...")
-    learner.learn_from_directory("engine_analysis/pgn_games")
+    start_time = time.time()
+    for game_stats in batch_match.game_data:
+        moves = (chess.Move.from_uci(uci) for uci, *_ in game_stats['moves'])
+        learner.learn_from_moves(moves, game_stats['result'])
+    elapsed = time.time() - start_time
+    print(f"Learned from {len(batch_match.game_data)} games in {elapsed:.2f} seconds")
     
     # Get and display statistics
     stats = learner.get_statistics()
@@ -34,44 +48,209 @@ def integrate_with_batch_analysis(batch_match):
     # Save the updated experience
     learner.save_experience()
 
-def run_single_batch(config):
-    start_game, batch_size, stockfish_elo, time_control = config
+STOCKFISH_PATH = "/opt/homebrew/bin/stockfish"
+STOCKFISH_HASH_MB = 128  # Per worker; kept warm across that worker's games
+# Entries in the MyEngine evaluation table shared by all workers (16 bytes each)
+EVAL_TABLE_ENTRIES = 1 << 20
+
+# Columnar per-game record: result/color/termination are small integer codes.
+# Kept as a plain field list; numpy is imported only where the summary is built,
+# so spawned pool workers never pay its import cost
+RESULT_DTYPE = [
+    ('result', 'i1'),   # LOSS, DRAW or WIN from MyEngine's point of view
+    ('color', 'i1'),    # 1 if MyEngine played white, 0 otherwise
+    ('term', 'i1'),     # Index into BatchEngineMatch.termination_names
+    ('moves', 'i4'),
+    ('book', 'i4'),
+    ('time', 'f4'),
+]
+LOSS, DRAW, WIN = 0, 1, 2
+
+# PGN tag section for one batch game; only a few fields vary between games
+_PGN_HEADER_TMPL = (
+    '[Event "Batch Analysis Game {game_num}"]\n'
+    '[Site "?"]\n'
+    '[Date "{date}"]\n'
+    '[Round "?"]\n'
+    '[White "{white}"]\n'
+    '[Black "{black}"]\n'
+    '[Result "{result}"]\n'
+    '[BlackElo "{black_elo}"]\n'
+    '[WhiteElo "{white_elo}"]\n'
+    '[Termination "{termination}"]\n'
+)
+
+# Per-game columns written to the summary CSV
+CSV_FIELDS = ['game_number', 'my_engine_played_white', 'num_moves', 'book_moves',
+              'result', 'winner', 'termination', 'total_time']
+
+# Names recorded for games that end on the board rather than by an early stop
+_TERM_MAP = {
+    chess.Termination.CHECKMATE: "checkmate",
+    chess.Termination.STALEMATE: "stalemate",
+    chess.Termination.INSUFFICIENT_MATERIAL: "insufficient_material",
+    chess.Termination.FIFTY_MOVES: "fifty_moves",
+}
+
+def _dumps(obj, indent=False):
+    """Encode obj as UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    return json.dumps(obj, indent=2 if indent else None).encode()
+
+def material_balance(board):
+    """White's material minus black's in centipawns, from piece bitboard popcounts."""
+    total = 0
+    for piece_type in (chess.PAWN, chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN):
+        white = chess.popcount(board.pieces_mask(piece_type, chess.WHITE))
+        black = chess.popcount(board.pieces_mask(piece_type, chess.BLACK))
+        total += piece_values[piece_type] * (white - black)
+    return total
+
+# Mercy rule threshold in centipawns (15 pawns worth)
+MERCY_MATERIAL_GAP = 1500
+
+def _material_gap_too_large(board):
+    """True if one side is ahead by more than the mercy rule allows."""
+    return abs(material_balance(board)) > MERCY_MATERIAL_GAP
+
+def _is_likely_draw(board):
+    """True if only kings and minor pieces are left (one bitboard test)."""
+    return not (board.pawns | board.rooks | board.queens)
+
+# (result, MyEngine played white) -> outcome code; anything else is a draw
+_OUTCOME_CODES = {
+    ("1-0", True): WIN,
+    ("1-0", False): LOSS,
+    ("0-1", True): LOSS,
+    ("0-1", False): WIN,
+}
+
+def _engine_outcome(game_stats):
+    """LOSS, DRAW or WIN for MyEngine, from a game's board-POV result string."""
+    return _OUTCOME_CODES.get((game_stats['result'], game_stats['my_engine_played_white']), DRAW)
+
+# Game progress goes through logging rather than print so pool workers do
+# not contend for stdout; -v shows one line per game, -vv every move
+logger = logging.getLogger(__name__)
+_VERBOSITY_LEVELS = (logging.WARNING, logging.INFO, logging.DEBUG)
+
+def format_pgn(game_stats, stockfish_elo, date):
+    """Return one finished game as PGN text, built from the SAN recorded during play."""
+    engine_is_white = game_stats['my_engine_played_white']
+    sf_elo = str(stockfish_elo)
+    header = _PGN_HEADER_TMPL.format(
+        game_num=game_stats['game_number'],
+        date=date,
+        white="MyEngine" if engine_is_white else "Stockfish",
+        black="Stockfish" if engine_is_white else "MyEngine",
+        result=game_stats['result'],
+        black_elo=sf_elo if engine_is_white else "?",
+        white_elo="?" if engine_is_white else sf_elo,
+        termination=game_stats['termination'],
+    )
+    
+    tokens = []
+    for ply, (_, san, is_book, _, _) in enumerate(game_stats['moves']):
+        if ply % 2 == 0:
+            tokens.append(f"{ply // 2 + 1}.")
+        tokens.append(san)
+        if is_book:
+            tokens.append("{ Book move }")
+    tokens.append(game_stats['result'])
+    
+    return header + "\n" + " ".join(tokens) + "\n\n"
+
+def _color_stats(counts):
+    """Summary block for one color from its [losses, draws, wins] counts."""
+    games = sum(counts)
+    stats = {
+        'games': games,
+        'wins': counts[WIN],
+        'losses': counts[LOSS],
+        'draws': counts[DRAW]
+    }
+    if games > 0:
+        stats['win_rate'] = (counts[WIN] / games) * 100
+        stats['loss_rate'] = (counts[LOSS] / games) * 100
+        stats['draw_rate'] = (counts[DRAW] / games) * 100
+    return stats
+
+# Stockfish handle, PGN Date tag and shared eval table owned by the current
+# pool worker (see _init_worker)
+_stockfish = None
+_pgn_date = None
+_eval_table = None
+_prethinker = None
+
+def _close_eval_table(eval_table):
+    detach_shared_eval_table()
+    eval_table.close()
+
+def _pool_context():
+    """
+    Use fork on Linux so workers inherit the already-loaded book, learner and
+    imports. Elsewhere keep the platform default: macOS defaults to spawn
+    because forking a process that uses system frameworks is unsafe there.
+    """
+    if sys.platform.startswith("linux"):
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+def _init_worker(stockfish_elo, log_level, pgn_date, eval_table_name):
+    """Open one Stockfish process per pool worker and reuse it for every game."""
+    global _stockfish, _pgn_date, _eval_table, _prethinker
+    _pgn_date = pgn_date
     
-    # Initialize stockfish
-    stockfish = chess.engine.SimpleEngine.popen_uci("/opt/homebrew/bin/stockfish")
-    stockfish.configure({
+    # Attach MyEngine's search to the batch-wide evaluation table; the parent
+    # process owns it and unlinks it once the pool has finished
+    _eval_table = shared_memory.SharedMemory(name=eval_table_name)
+    attach_shared_eval_table(_eval_table.buf)
+    Finalize(_eval_table, _close_eval_table, args=(_eval_table,), exitpriority=5)
+    
+    # Spawned workers do not inherit the parent's logger level
+    logger.setLevel(log_level)
+    _stockfish = chess.engine.SimpleEngine.popen_uci(STOCKFISH_PATH)
+    _stockfish.configure({
         "UCI_LimitStrength": True,
-        "UCI_Elo": stockfish_elo
+        "UCI_Elo": stockfish_elo,
+        "Hash": STOCKFISH_HASH_MB
     })
+    # Quit the engine when the worker shuts down after pool.close()/join()
+    Finalize(_stockfish, _stockfish.quit, exitpriority=10)
+    # Single background thread for MyEngine searches started while Stockfish
+    # thinks (--prethink); no thread is created until the first submit
+    _prethinker = ThreadPoolExecutor(max_workers=1)
+    Finalize(_prethinker, _prethinker.shutdown, exitpriority=10)
+
+def run_single_game(config):
+    game_num, stockfish_elo, time_control, my_engine_is_white, seed, ponder, prethink = config
     
-    batch_results = []
+    # Forked workers inherit the parent's RNG state, so reseed per game to
+    # keep opening book choices independent across workers
+    random.seed(seed)
     try:
-        for game_num in range(start_game, start_game + batch_size):
-            try:
-                my_engine_is_white = random.choice([True, False])
-                board = chess.Board()
-                game_stats = play_game(
-                    game_num, 
-                    stockfish_elo, 
-                    time_control,
-                    my_engine_is_white,
-                    stockfish,
-                    board
-                )
-                batch_results.append(game_stats)
-                print(f"Completed game {game_num + 1}")
-            except Exception as e:
-                print(f"Error in game {game_num + 1}: {str(e)}")
-    finally:
-        stockfish.quit()
-    
-    return batch_results
+        game_stats = play_game(
+            game_num, 
+            stockfish_elo, 
+            time_control,
+            my_engine_is_white,
+            _stockfish,
+            chess.Board(),
+            ponder=ponder,
+            prethinker=_prethinker if prethink else None
+        )
+        # Format the PGN here so the main process only has to write it
+        return game_stats, format_pgn(game_stats, stockfish_elo, _pgn_date)
+    except Exception as e:
+        logger.error("Error in game %d: %s", game_num + 1, e)
+        return None
 
-def play_game(game_num, stockfish_elo, time_control, my_engine_is_white, stockfish, board):       
-        print(f"\nStarting game {game_num + 1}...")
-        print(f"Playing as {'White' if my_engine_is_white else 'Black'}")
+def play_game(game_num, stockfish_elo, time_control, my_engine_is_white, stockfish, board, ponder=False,
+              prethinker=None):
+        logger.debug("Starting game %d, playing as %s",
+                     game_num + 1, "White" if my_engine_is_white else "Black")
         
-        moves = []
         game_stats = {
             'game_number': game_num + 1,
             'my_engine_played_white': my_engine_is_white,
@@ -90,150 +269,198 @@ def play_game(game_num, stockfish_elo, time_control, my_engine_is_white, stockfi
         move_timeout = 10
         
         # Track repeated positions
-        position_count = defaultdict(int)
+        position_count = {}
         repeated_position_limit = 3
+
+        # Bind per-ply lookups once; the Stockfish limit never changes mid-game
+        limit = chess.engine.Limit(time=time_control)
+        stockfish_play = stockfish.play
+        board_push = board.push
+        record_move = game_stats['moves'].append
+        engine_color = chess.WHITE if my_engine_is_white else chess.BLACK
+        clear_debug_info = debug_info.clear
+        get_debug_info = debug_info.get
+        now = time.time
+        position_key = board._transposition_key
+        board_san = board.san
+        legal_moves = board.generate_legal_moves
+
+        # Material balance for the mercy rule; it only changes on a capture or
+        # promotion, so it is refreshed only when the halfmove clock resets
+        material = material_balance(board)
         
-        def material_difference_too_large(board):
-            return abs(evaluate_board(board)) > 1500
-            
-        def is_likely_draw(board):
-            if (len(list(board.pieces(chess.PAWN, chess.WHITE))) == 0 and 
-                len(list(board.pieces(chess.PAWN, chess.BLACK))) == 0 and 
-                len(list(board.pieces(chess.ROOK, chess.WHITE))) == 0 and 
-                len(list(board.pieces(chess.ROOK, chess.BLACK))) == 0 and 
-                len(list(board.pieces(chess.QUEEN, chess.WHITE))) == 0 and 
-                len(list(board.pieces(chess.QUEEN, chess.BLACK))) == 0):
-                return True
-            return False
-
-        while not board.is_game_over() and move_count < max_moves:
+        # Set when the game ends on the board (mate, stalemate, draw rules)
+        outcome = None
+        
+        # With a prethinker, Stockfish's principal variation is kept so that,
+        # when MyEngine plays the reply Stockfish expected, MyEngine can search
+        # the position after Stockfish's predicted answer while Stockfish thinks
+        stockfish_info = chess.engine.INFO_PV if prethinker is not None else chess.engine.INFO_NONE
+        stockfish_pv = ()
+        pondered = None
+
+        while move_count < max_moves:
             move_count += 1
-            move_start_time = time.time()
+            move_start_time = now()
             
             # Check for repeated positions
-            current_pos = board.fen().split(' ')[0]
-            position_count[current_pos] += 1
-            if position_count[current_pos] >= repeated_position_limit:
-                print(f"Position repeated {repeated_position_limit} times - forcing draw")
+            current_pos = position_key()
+            seen = position_count.get(current_pos, 0) + 1
+            position_count[current_pos] = seen
+            if seen >= repeated_position_limit:
+                logger.debug("Position repeated %d times - forcing draw", repeated_position_limit)
                 game_stats['termination'] = "repetition"
                 game_stats['result'] = "1/2-1/2"
                 game_stats['winner'] = "Draw"
                 break
             
             # Check early stopping conditions
-            if material_difference_too_large(board):
+            if abs(material) > MERCY_MATERIAL_GAP:
                 game_stats['termination'] = "mercy_rule"
-                game_stats['result'] = "1-0" if evaluate_board(board) > 0 else "0-1"
+                game_stats['result'] = "1-0" if material > 0 else "0-1"
                 game_stats['winner'] = "Draw"
                 break
                 
-            if is_likely_draw(board):
+            # Likely draw once no pawns, rooks or queens remain (the
+            # _is_likely_draw test, inlined). They can only disappear on a move
+            # that resets the halfmove clock, so the test is skipped otherwise
+            if board.halfmove_clock == 0 and not (board.pawns | board.rooks | board.queens):
                 game_stats['termination'] = "likely_draw"
                 game_stats['result'] = "1/2-1/2"
                 game_stats['winner'] = "Draw"
                 break
 
             try:
-                is_engine_turn = (board.turn == chess.WHITE) == my_engine_is_white
+                is_engine_turn = board.turn == engine_color
                 
                 if is_engine_turn:
-                    print(f"Engine thinking... (move {move_count})")
-                    debug_info.clear()
-                    move = next_move(2, board)  # Reduced depth for speed
-                    is_book = debug_info.get("book_move", False)
+                    if pondered is not None and board.peek() == guess:
+                        # Stockfish played the predicted move: the search is
+                        # already done (or under way), debug_info included
+                        move = pondered.result()
+                    else:
+                        if pondered is not None:
+                            # Wrong guess; let that search finish before
+                            # next_move reuses debug_info and the TT
+                            pondered.exception()
+                        clear_debug_info()
+                        move = next_move(2, board)  # Reduced depth for speed
+                    pondered = None
+                    is_book = get_debug_info("book_move", False)
                     if is_book:
                         game_stats['book_moves'] += 1
-                    print(f"Engine chose move: {move}")
                 else:
-                    print(f"Stockfish thinking... (move {move_count})")
+                    if (prethinker is not None and len(stockfish_pv) > 2
+                            and board.peek() == stockfish_pv[1]):
+                        guess = stockfish_pv[2]
+                        ahead = board.copy()
+                        ahead.push(guess)
+                        pondered = prethinker.submit(next_move, 2, ahead)
                     try:
-                        result = stockfish.play(board, chess.engine.Limit(time=time_control))
+                        # python-chess sends "position startpos moves ...", not a FEN.
+                        # No game tag: ucinewgame goes out only for the worker's first
+                        # game (the Elo is fixed per pool), so Stockfish's hash stays
+                        # warm across games. With ponder, Stockfish keeps searching
+                        # while MyEngine thinks
+                        result = stockfish_play(board, limit, ponder=ponder, info=stockfish_info)
                         move = result.move
-                        print(f"Stockfish chose move: {move}")
+                        stockfish_pv = result.info.get("pv", ())
                     except chess.engine.EngineTerminatedError:
-                        print("Stockfish process terminated unexpectedly")
+                        logger.error("Stockfish process terminated unexpectedly")
                         raise
                     except Exception as e:
-                        print(f"Stockfish error: {str(e)}")
+                        logger.error("Stockfish error: %s", e)
                         raise
                     is_book = False
                 
                 # Check for timeout
-                if time.time() - move_start_time > move_timeout:
-                    print(f"Move {move_count} timed out")
+                if now() - move_start_time > move_timeout:
+                    logger.info("Move %d timed out", move_count)
                     game_stats['termination'] = "timeout"
                     game_stats['result'] = "1/2-1/2"
                     game_stats['winner'] = "Draw"
                     break
                 
                 if move is None:
-                    print(f"No move returned on move {move_count}")
+                    logger.info("No move returned on move %d", move_count)
                     game_stats['termination'] = "no_move"
                     game_stats['result'] = "1/2-1/2"
                     game_stats['winner'] = "Draw"
                     break
                     
-                board.push(move)
-                moves.append((move, is_book))
-                game_stats['moves'].append({
-                    'move': move.uci(),
-                    'is_book': is_book,
-                    'ply': len(board.move_stack),
-                    'player': 'MyEngine' if is_engine_turn else 'Stockfish'
-                })
+                # SAN needs the position before the move, and is computed here
+                # (in the worker) so format_pgn can write movetext without a replay
+                san = board_san(move)
+                board_push(move)
+                # (uci, san, is_book, ply, played_by_my_engine); move_count is the ply just played
+                record_move((move.uci(), san, is_book, move_count, is_engine_turn))
+                
+                if board.halfmove_clock == 0:
+                    material = material_balance(board)
+                    # Captures and pawn moves are irreversible, so no earlier
+                    # position can repeat; this keeps the counter to <= 100 keys
+                    position_count.clear()
                 
-                # Print move info with current evaluation
-                eval_score = evaluate_board(board)
-                print(f"Move {move_count}: {move.uci()} {'(book)' if is_book else ''} [Eval: {eval_score/100:.2f}]")
+                # Log move info with current evaluation (only evaluated when shown)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Move %d: %s %s%s [Eval: %.2f]", move_count, move.uci(),
+                                 "MyEngine" if is_engine_turn else "Stockfish",
+                                 " (book)" if is_book else "", cached_evaluate(board) / 100)
                 
-                # Small delay between moves
-                time.sleep(0.1)
+                # Cheaper than board.is_game_over(): no legal reply means mate
+                # or stalemate, and material can only become insufficient
+                # after a capture or pawn move (which reset the halfmove clock)
+                # The Outcome is recorded here so nothing is re-checked after the loop
+                if not any(legal_moves()):
+                    if board.is_check():
+                        outcome = chess.Outcome(chess.Termination.CHECKMATE, not board.turn)
+                    else:
+                        outcome = chess.Outcome(chess.Termination.STALEMATE, None)
+                    break
+                if board.halfmove_clock >= 100:
+                    outcome = chess.Outcome(chess.Termination.FIFTY_MOVES, None)
+                    break
+                if board.halfmove_clock == 0 and board.is_insufficient_material():
+                    outcome = chess.Outcome(chess.Termination.INSUFFICIENT_MATERIAL, None)
+                    break
                 
             except Exception as e:
-                print(f"Error on move {move_count}: {str(e)}")
-                print(f"Current position FEN: {board.fen()}")
-                print(f"Legal moves: {list(board.legal_moves)}")
+                logger.error("Error on move %d: %s (FEN: %s)", move_count, e, board.fen())
+                if pondered is not None:
+                    pondered.exception()
                 raise
         
+        # Never leave a search running into the worker's next game
+        if pondered is not None:
+            pondered.exception()
+        
         game_stats['total_time'] = time.time() - start_time
-        game_stats['num_moves'] = len(moves)
+        game_stats['num_moves'] = len(game_stats['moves'])
         
         # Handle game ending if not already set
         if not game_stats.get('result'):
-            if board.is_checkmate():
-                white_won = board.turn == chess.BLACK
-                if white_won == my_engine_is_white:
-                    winner = "MyEngine"
-                    result = "1-0"
-                else:
-                    winner = "Stockfish"
-                    result = "0-1"
-                game_stats['termination'] = "checkmate"
-            elif board.is_stalemate():
-                winner = "Draw"
-                result = "1/2-1/2"
-                game_stats['termination'] = "stalemate"
-            elif board.is_insufficient_material():
-                winner = "Draw"
-                result = "1/2-1/2"
-                game_stats['termination'] = "insufficient_material"
-            else:
-                winner = "Draw"
-                result = "1/2-1/2"
+            if outcome is None:
+                # Move limit reached with the game still in progress
                 game_stats['termination'] = "other"
-                
-            game_stats['winner'] = winner
-            game_stats['result'] = result
-        
-        print(f"\nGame {game_num + 1} completed:")
-        print(f"Result: {game_stats['result']}")
-        print(f"Termination: {game_stats['termination']}")
-        print(f"Moves played: {game_stats['num_moves']}")
+                game_stats['result'] = "1/2-1/2"
+                game_stats['winner'] = "Draw"
+            else:
+                game_stats['termination'] = _TERM_MAP.get(outcome.termination, "other")
+                game_stats['result'] = outcome.result()
+                if outcome.winner is None:
+                    game_stats['winner'] = "Draw"
+                else:
+                    engine_won = outcome.winner == my_engine_is_white
+                    game_stats['winner'] = "MyEngine" if engine_won else "Stockfish"
         
         return game_stats    
 
 class BatchEngineMatch:
-    def __init__(self):
+    def __init__(self, verbose=0):
+        # 0: quiet, 1: one line per game, 2: every move
+        self.verbose = verbose
+        logger.setLevel(_VERBOSITY_LEVELS[min(verbose, 2)])
+        
         # Create base directory structure
         self.base_dir = "engine_analysis"
         self.pgn_dir = os.path.join(self.base_dir, "pgn_games")
@@ -242,8 +469,12 @@ class BatchEngineMatch:
         for directory in [self.base_dir, self.pgn_dir, self.stats_dir]:
             if not os.path.exists(directory):
                 os.makedirs(directory)
+        
+        # PGN Date tag, computed once and handed to every pool worker
+        self._date_header = datetime.now().strftime("%Y.%m.%d")
                 
-        self.results = defaultdict(list)
+        self.results = None  # Structured array once build_results() has run
+        self.termination_names = []
         self.game_data = []
         self.stockfish = None  # Initialize stockfish as None
     
@@ -256,223 +487,184 @@ class BatchEngineMatch:
         except Exception as e:
             print(f"Error closing stockfish: {e}")
 
-        
-    def run_game_batch(self, start_game, batch_size, stockfish_elo, time_control):
-        """Run a batch of games."""
-        stockfish = chess.engine.SimpleEngine.popen_uci("/opt/homebrew/bin/stockfish")
-        stockfish.configure({
-            "UCI_LimitStrength": True,
-            "UCI_Elo": stockfish_elo
-        })
-        
-        batch_results = []
-        for game_num in range(start_game, start_game + batch_size):
-            try:
-                my_engine_is_white = random.choice([True, False])
-                game_stats = self.play_single_game(
-                    game_num, stockfish_elo, time_control, 
-                    my_engine_is_white, stockfish
-                )
-                batch_results.append(game_stats)
-                print(f"Completed game {game_num + 1}")
-            except Exception as e:
-                print(f"Error in game {game_num + 1}: {str(e)}")
-        
-        stockfish.quit()
-        return batch_results
-
     def material_difference_too_large(self, board):
         """Check if material difference is too large."""
-        return abs(evaluate_board(board)) > 1500  # 15 pawns worth
+        return _material_gap_too_large(board)
     
     def is_likely_draw(self, board):
         """Check for likely draw conditions."""
-        # Only kings left
-        if (len(list(board.pieces(chess.PAWN, chess.WHITE))) == 0 and 
-            len(list(board.pieces(chess.PAWN, chess.BLACK))) == 0 and 
-            len(list(board.pieces(chess.ROOK, chess.WHITE))) == 0 and 
-            len(list(board.pieces(chess.ROOK, chess.BLACK))) == 0 and 
-            len(list(board.pieces(chess.QUEEN, chess.WHITE))) == 0 and 
-            len(list(board.pieces(chess.QUEEN, chess.BLACK))) == 0):
-            return True
-        return False
-    def play_batch(self, num_games, stockfish_elo=1500, time_control=0.1, num_cores=None):
+        return _is_likely_draw(board)
+    def play_batch(self, num_games, stockfish_elo=1500, time_control=0.1, num_cores=None, ponder=False,
+                   prethink=False, seed=None):
+        # Only the main process draws the progress bar; keep tqdm out of workers
+        from tqdm import tqdm
+        
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.stockfish_elo = stockfish_elo
         
         if num_cores is None:
-            num_cores = multiprocessing.cpu_count() - 1
+            num_cores = max(1, multiprocessing.cpu_count() - 1)
         num_cores = min(num_cores, num_games)
         
         print(f"\nStarting batch of {num_games} games using {num_cores} cores")
         
-        # Create batch configurations
-        batch_configs = []
-        games_per_core = num_games // num_cores
-        remaining_games = num_games % num_cores
-        start_game = 0
+        # All of the batch's randomness (color order, per-game seeds) comes
+        # from one generator, so passing a seed makes the batch reproducible
+        rng = random.Random(seed)
         
-        for i in range(num_cores):
-            batch_size = games_per_core + (1 if i < remaining_games else 0)
-            if batch_size > 0:
-                batch_configs.append((start_game, batch_size, stockfish_elo, time_control))
-                start_game += batch_size
+        # Play an equal number of games with each color, in shuffled order
+        colors = [True] * (num_games // 2) + [False] * (num_games - num_games // 2)
+        rng.shuffle(colors)
         
-        # Run games in parallel
-        with multiprocessing.Pool(num_cores) as pool:
-            all_results = pool.map(run_single_batch, batch_configs)
+        # One task per game; each worker reuses its own Stockfish process
+        game_configs = [
+            (game_num, stockfish_elo, time_control,
+             colors[game_num], rng.getrandbits(32), ponder, prethink)
+            for game_num in range(num_games)
+        ]
+        
+        # Run games in parallel, appending each finished game to an NDJSON
+        # file so a crash part way through keeps the games already played
+        self.game_data = []
+        tally = [0, 0, 0]  # Running LOSS/DRAW/WIN counts for the progress bar
+        games_path = os.path.join(self.stats_dir, f"games_{timestamp}.ndjson")
+        # Every game of the batch goes to a single PGN file, in finishing order
+        batch_pgn_path = os.path.join(self.pgn_dir, f"batch_{timestamp}.pgn")
+        # The per-game CSV is written the same way, while the workers play
+        csv_path = os.path.join(self.stats_dir, f"summary_{timestamp}.csv")
+        # Worker log lines would land in the middle of the progress bar, so while
+        # it is shown workers only log warnings and the parent reports finished
+        # games. Per-move logging (-vv) replaces the bar instead
+        show_progress = self.verbose < 2
+        worker_log_level = max(logger.level, logging.WARNING) if show_progress else logger.level
+        # Zeroed slot table that lets every worker reuse MyEngine's evaluations
+        eval_table = shared_memory.SharedMemory(create=True, size=EVAL_TABLE_ENTRIES * 16)
+        try:
+            with _pool_context().Pool(num_cores, initializer=_init_worker,
+                                      initargs=(stockfish_elo, worker_log_level, self._date_header,
+                                                eval_table.name)) as pool, \
+                    open(games_path, "wb") as games_file, \
+                    open(batch_pgn_path, "w", buffering=1 << 20) as pgn_file, \
+                    open(csv_path, "w", newline="") as csv_file:
+                # One row per game without the move list
+                csv_writer = csv.DictWriter(csv_file, fieldnames=CSV_FIELDS, extrasaction='ignore')
+                csv_writer.writeheader()
+                
+                # Games finish out of order; each is its own task so a long game
+                # does not hold back the others queued on the same worker
+                results = pool.imap_unordered(run_single_game, game_configs, chunksize=1)
+                progress = tqdm(results, total=num_games, disable=not show_progress,
+                                desc="Games", unit="game", miniters=max(1, num_games // 100))
+                for finished in progress:
+                    if finished is None:
+                        continue
+                    game_stats, pgn_text = finished
+                    self.game_data.append(game_stats)
+                    # The moves are already in the PGN; keep the NDJSON record per-game only
+                    record = {k: v for k, v in game_stats.items() if k != 'moves'}
+                    games_file.write(_dumps(record) + b"\n")
+                    games_file.flush()
+                    pgn_file.write(pgn_text)
+                    csv_writer.writerow(game_stats)
+                    if logger.isEnabledFor(logging.INFO):
+                        progress.write(f"Game {game_stats['game_number']} completed: {game_stats['result']} "
+                                       f"by {game_stats['termination']} after {game_stats['num_moves']} moves")
+                
+                    tally[_engine_outcome(game_stats)] += 1
+                    if len(self.game_data) % 10 == 0:
+                        progress.set_postfix(W=tally[WIN], D=tally[DRAW], L=tally[LOSS], refresh=False)
+                progress.close()
+                # Let workers exit normally so their Stockfish finalizers run
+                pool.close()
+                pool.join()
+        finally:
+            eval_table.close()
+            eval_table.unlink()
         
-        # Combine results
-        self.game_data = [game for batch in all_results for game in batch if game is not None]
+        self.game_data.sort(key=lambda game: game['game_number'])
+        self.build_results()
         
         if self.game_data:
-            # Save PGN files for each game
-            for i, game_stats in enumerate(self.game_data):
-                self.save_pgn(game_stats, timestamp, i)
-                
+            # Summarize once; the same dict goes into the stats file and back to the caller
+            summary = self.generate_summary()
+            
             # Save statistics and learn from games
-            self.save_statistics(timestamp, stockfish_elo)
+            self.save_statistics(timestamp, stockfish_elo, summary)
             print("\nLearning from played games...")
             integrate_with_batch_analysis(self)
             
-            return self.generate_summary()
+            return summary
         else:
             print("No games completed successfully")
             return None            
-    def save_pgn(self, game_stats, timestamp, game_num):
-        """Save individual game PGN."""
-        # Just use the already initialized pgn_dir from __init__
-        if not os.path.exists(self.pgn_dir):
-            os.makedirs(self.pgn_dir)
-            
-        game = chess.pgn.Game()
-        
-        # Set headers
-        game.headers["Event"] = f"Batch Analysis Game {game_num + 1}"
-        game.headers["Date"] = datetime.now().strftime("%Y.%m.%d")
-        
-        # Set player names based on who played which color
-        if game_stats['my_engine_played_white']:
-            game.headers["White"] = "MyEngine"
-            game.headers["Black"] = "Stockfish"
-        else:
-            game.headers["White"] = "Stockfish"
-            game.headers["Black"] = "MyEngine"
-            
-        game.headers["Result"] = game_stats['result']
-        game.headers["BlackElo"] = str(self.stockfish_elo) if game_stats['my_engine_played_white'] else "?"
-        game.headers["WhiteElo"] = "?" if game_stats['my_engine_played_white'] else str(self.stockfish_elo)
-        game.headers["Termination"] = game_stats['termination']
-        
-        # Add moves
-        node = game
-        for move_data in game_stats['moves']:
-            move = chess.Move.from_uci(move_data['move'])
-            node = node.add_variation(move)
-            if move_data['is_book']:
-                node.comment = "Book move"
-        
-        # Save to file
-        filename = f"game_{timestamp}_{game_num + 1}.pgn"
-        filepath = os.path.join(self.pgn_dir, filename)
-        
-        with open(filepath, "w") as f:
-            print(game, file=f, end="\n\n")
-
-    def save_statistics(self, timestamp, stockfish_elo):
-        """Save comprehensive statistics to JSON and CSV."""
-        def convert_numpy(obj):
-            if isinstance(obj, np.integer):
-                return int(obj)
-            elif isinstance(obj, np.floating):
-                return float(obj)
-            elif isinstance(obj, np.ndarray):
-                return obj.tolist()
-            elif isinstance(obj, dict):
-                return {k: convert_numpy(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_numpy(item) for item in obj]
-            return obj
-
+    def save_statistics(self, timestamp, stockfish_elo, summary=None):
+        """Save the batch summary to JSON; the per-game CSV is written during play_batch."""
+        if summary is None:
+            summary = self.generate_summary()
         stats = {
             'timestamp': timestamp,
             'stockfish_elo': stockfish_elo,
             'num_games': len(self.game_data),
-            'summary': convert_numpy(self.generate_summary()),
-            'game_data': convert_numpy(self.game_data)
+            'summary': summary,
+            'games_file': f"games_{timestamp}.ndjson",
+            'pgn_file': f"batch_{timestamp}.pgn",
+            'csv_file': f"summary_{timestamp}.csv"
         }
         
         try:
-            # Save detailed JSON
+            # Save summary JSON; per-game records are already in the NDJSON file
             json_path = os.path.join(self.stats_dir, f"stats_{timestamp}.json")
-            with open(json_path, "w") as f:
-                json.dump(stats, f, indent=2)
+            with open(json_path, "wb") as f:
+                f.write(_dumps(stats, indent=True))
             print(f"\nStatistics saved to: {json_path}")
-            
-            # Save CSV summary
-            df = pd.DataFrame(self.game_data)
-            csv_path = os.path.join(self.stats_dir, f"summary_{timestamp}.csv")
-            df.to_csv(csv_path, index=False)
-            print(f"Summary saved to: {csv_path}")
+            print(f"Summary saved to: {os.path.join(self.stats_dir, stats['csv_file'])}")
             
         except Exception as e:
             print(f"Error saving statistics: {str(e)}")
+    def build_results(self):
+        """Pack game_data into the columnar results array used for summaries."""
+        self.termination_names = list(dict.fromkeys(game['termination'] for game in self.game_data))
+        term_codes = {name: code for code, name in enumerate(self.termination_names)}
+        
+        import numpy as np
+        
+        results = np.empty(len(self.game_data), dtype=RESULT_DTYPE)
+        for i, game in enumerate(self.game_data):
+            is_white = game['my_engine_played_white']
+            results[i] = (_engine_outcome(game), is_white, term_codes[game['termination']],
+                          game['num_moves'], game['book_moves'], game['total_time'])
+        self.results = results
+
     def generate_summary(self):
         """Generate summary statistics."""
         # Check if there's any data
-        if not self.game_data:
+        if self.results is None or self.results.size == 0:
             return None
         
+        import numpy as np
+        
         try:
-            total_games = len(self.game_data)
-            
-            # Count results
-            wins = sum(1 for game in self.game_data if 
-                      (game['result'] == "1-0" and game['my_engine_played_white']) or 
-                      (game['result'] == "0-1" and not game['my_engine_played_white']))
-            losses = sum(1 for game in self.game_data if 
-                        (game['result'] == "0-1" and game['my_engine_played_white']) or 
-                        (game['result'] == "1-0" and not game['my_engine_played_white']))
-            draws = sum(1 for game in self.game_data if game['result'] == "1/2-1/2")
+            results = self.results
+            total_games = len(results)
             
-            # Split games by color
-            white_games = [game for game in self.game_data if game['my_engine_played_white']]
-            black_games = [game for game in self.game_data if not game['my_engine_played_white']]
+            # Count results per color in one pass: bins 0-2 are MyEngine as
+            # black, 3-5 as white. tolist() keeps numpy scalars out of the summary
+            by_color = np.bincount(results['color'] * 3 + results['result'], minlength=6).tolist()
+            as_black, as_white = by_color[:3], by_color[3:]
+            overall = [b + w for b, w in zip(as_black, as_white)]
+            wins, draws, losses = overall[WIN], overall[DRAW], overall[LOSS]
             
-            # Calculate white statistics
-            white_stats = {
-                'games': len(white_games),
-                'wins': sum(1 for game in white_games if game['result'] == "1-0"),
-                'losses': sum(1 for game in white_games if game['result'] == "0-1"),
-                'draws': sum(1 for game in white_games if game['result'] == "1/2-1/2")
-            }
-            if white_stats['games'] > 0:
-                white_stats['win_rate'] = (white_stats['wins'] / white_stats['games']) * 100
-                white_stats['loss_rate'] = (white_stats['losses'] / white_stats['games']) * 100
-                white_stats['draw_rate'] = (white_stats['draws'] / white_stats['games']) * 100
-            
-            # Calculate black statistics
-            black_stats = {
-                'games': len(black_games),
-                'wins': sum(1 for game in black_games if game['result'] == "0-1"),
-                'losses': sum(1 for game in black_games if game['result'] == "1-0"),
-                'draws': sum(1 for game in black_games if game['result'] == "1/2-1/2")
-            }
-            if black_stats['games'] > 0:
-                black_stats['win_rate'] = (black_stats['wins'] / black_stats['games']) * 100
-                black_stats['loss_rate'] = (black_stats['losses'] / black_stats['games']) * 100
-                black_stats['draw_rate'] = (black_stats['draws'] / black_stats['games']) * 100
+            white_stats = _color_stats(as_white)
+            black_stats = _color_stats(as_black)
             
             # Calculate averages
-            avg_moves = sum(game['num_moves'] for game in self.game_data) / total_games if total_games > 0 else 0
-            avg_book_moves = sum(game['book_moves'] for game in self.game_data) / total_games if total_games > 0 else 0
-            avg_time = sum(game['total_time'] for game in self.game_data) / total_games if total_games > 0 else 0
+            avg_moves = float(results['moves'].mean())
+            avg_book_moves = float(results['book'].mean())
+            avg_time = float(results['time'].mean(dtype=np.float64))
             
             # Count termination types
-            termination_types = {}
-            for game in self.game_data:
-                term_type = game['termination']
-                termination_types[term_type] = termination_types.get(term_type, 0) + 1
+            term_counts = np.bincount(results['term'], minlength=len(self.termination_names))
+            termination_types = dict(zip(self.termination_names, term_counts.tolist()))
             
             # Create summary dictionary
             summary = {
@@ -500,6 +692,18 @@ class BatchEngineMatch:
             return None
 
 def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Batch Chess Engine Analysis")
+    parser.add_argument("--jobs", type=int, default=None, help="Number of worker processes (default: CPU count - 1)")
+    parser.add_argument("--ponder", action="store_true", help="Let Stockfish ponder while MyEngine is thinking")
+    parser.add_argument("--prethink", action="store_true",
+                        help="Start MyEngine's next search on Stockfish's expected move while Stockfish thinks")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for color order and opening book choices")
+    parser.add_argument("-v", "--verbose", action="count", default=0, help="Log per-game (-v) or per-move (-vv) progress")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    
     print("Batch Chess Engine Analysis")
     print("=" * 50)
 
@@ -515,14 +719,15 @@ def main():
             print("Please enter valid numbers")
 
     # Get number of cores for parallel processing
-    num_cores = multiprocessing.cpu_count() - 1
+    num_cores = args.jobs if args.jobs else max(1, multiprocessing.cpu_count() - 1)
     num_cores = min(num_cores, num_games)  # Don't use more cores than games
     print(f"\nUsing {num_cores} cores for parallel processing")
 
     # Create and run batch analysis
-    batch = BatchEngineMatch()
+    batch = BatchEngineMatch(verbose=args.verbose)
     try:
-        summary = batch.play_batch(num_games, stockfish_elo=elo, num_cores=num_cores)
+        summary = batch.play_batch(num_games, stockfish_elo=elo, num_cores=num_cores, ponder=args.ponder,
+                                   prethink=args.prethink, seed=args.seed)
         if summary:  # Check if summary exists
             print("\nAnalysis Complete!")
             print("=" * 50)
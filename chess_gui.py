@@ -3,10 +3,21 @@ import chess
 import chess.pgn
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from movegeneration import next_move, debug_info
-from evaluate import evaluate_board
-from pgn_handler import PGNHandler
+from movegeneration import next_move, debug_info, cached_evaluate
+from evaluate import evaluate_delta
+from pgn_handler import PGNHandler, format_pgn
+
+# Game over messages for drawn games, by how the game ended
+DRAW_MESSAGES = {
+    chess.Termination.STALEMATE: "Game drawn by stalemate",
+    chess.Termination.INSUFFICIENT_MATERIAL: "Game drawn by insufficient material",
+    chess.Termination.FIFTY_MOVES: "Game drawn by fifty-move rule",
+    chess.Termination.SEVENTYFIVE_MOVES: "Game drawn by fifty-move rule",
+    chess.Termination.THREEFOLD_REPETITION: "Game drawn by repetition",
+    chess.Termination.FIVEFOLD_REPETITION: "Game drawn by repetition",
+}
 
 class GameSaver:
     def __init__(self, save_directory="engine_analysis/pgn_games"):
@@ -17,30 +28,25 @@ class GameSaver:
     
     def save_game(self, board, white_name="MyEngine", black_name="Human", result=None):
         """Save a chess game in PGN format."""
-        game = chess.pgn.Game()
+        headers = {}
         
         # Set headers
-        game.headers["Event"] = "Training Game"
-        game.headers["Site"] = "Local Computer"
-        game.headers["Date"] = datetime.now().strftime("%Y.%m.%d")
-        game.headers["Round"] = "1"
-        game.headers["White"] = white_name
-        game.headers["Black"] = black_name
-        game.headers["Result"] = result or "*"
-        
-        # Add all moves
-        node = game
-        for move in board.move_stack:
-            node = node.add_variation(move)
+        headers["Event"] = "Training Game"
+        headers["Site"] = "Local Computer"
+        headers["Date"] = datetime.now().strftime("%Y.%m.%d")
+        headers["Round"] = "1"
+        headers["White"] = white_name
+        headers["Black"] = black_name
+        headers["Result"] = result or "*"
         
         # Generate filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"game_{white_name}_vs_{black_name}_{timestamp}.pgn"
         filepath = os.path.join(self.save_directory, filename)
         
-        # Save to file
+        # Save to file; the movetext comes straight from the move stack
         with open(filepath, "w") as f:
-            print(game, file=f, end="\n\n")
+            f.write(format_pgn(board, headers))
         
         return filepath
 
@@ -53,6 +59,8 @@ class ChessGUI:
         self.square_size = self.board_size // 8
         self.screen = pygame.display.set_mode((width, height))
         pygame.display.set_caption("Chess Engine")
+        # pygame-ce's fblits skips building the list of rects that blits returns
+        self.has_fblits = hasattr(self.screen, 'fblits')
 
         # Create base directory if it doesn't exist
         self.base_dir = "engine_analysis"
@@ -65,21 +73,26 @@ class ChessGUI:
 
         # Initialize PGN handler with correct path
         self.pgn_handler = PGNHandler(directory=pgn_dir)
-        
-        # Initialize game saver
-        self.game_saver = GameSaver()
 
         # Add book move tracking
         self.last_move_from_book = False
         # Add a font for book move display
         self.font = pygame.font.SysFont('Arial', 20)
+        # Fonts for the eval bar label and the game over message; SysFont
+        # searches the system font list, so never call it per frame
+        self.font_small = pygame.font.SysFont('Arial', 14)
+        self.font_large = pygame.font.SysFont('Arial', 32)
+        # Rendered text surfaces keyed by (text, color, font)
+        self.text_cache = {}
+        # The eval label changes on every animation frame, so it only keeps
+        # its latest rendering instead of filling up text_cache
+        self.eval_label_text = None
+        self.eval_label = None
         # Status text position
         self.status_x = self.board_size + 50
         self.status_y = self.height - 200
 
-        # Initialize PGN handler
-        self.pgn_handler = PGNHandler()
-        # Add game history tracking
+        # Add game history tracking (chess.Move objects, shown as UCI)
         self.move_history = []
         self.current_move_index = 0
 
@@ -94,6 +107,22 @@ class ChessGUI:
         self.load_button = pygame.Rect(button_x, base_button_y + spacing, button_width, button_height)
         self.prev_button = pygame.Rect(button_x, base_button_y + spacing * 2, button_width, button_height)
         self.next_button = pygame.Rect(button_x, base_button_y + spacing * 3, button_width, button_height)
+        
+        # Button labels never change; render and center them once
+        self.button_labels = []
+        for button, text in [
+            (self.save_button, "Save PGN"),
+            (self.load_button, "Load PGN"),
+            (self.prev_button, "← Previous"),
+            (self.next_button, "Next →")
+        ]:
+            text_surf = self.font.render(text, True, (0, 0, 0)).convert_alpha()
+            self.button_labels.append((button, text_surf, text_surf.get_rect(center=button.center)))
+        self.history_title = self.font.render("Move History:", True, (0, 0, 0)).convert_alpha()
+        # The eval bar overlaps the buttons' left edge, so bar-only frames
+        # repaint the buttons too and push this area along with the bar
+        self.button_area = self.save_button.unionall(
+            [self.load_button, self.prev_button, self.next_button])
     
         # Evaluation bar parameters
         self.eval_bar_width = 30
@@ -102,13 +131,38 @@ class ChessGUI:
         self.eval_bar_y = 0
         self.current_eval = 0
         self.smooth_eval = 0
+        # Position current_eval belongs to; moves from it are scored incrementally
+        self.eval_key = None
+        # The bar's background and its 2px centerline never move; keep their
+        # rects so each frame is three rect fills and the label blit
+        self.eval_bar_background = pygame.Rect(self.eval_bar_x, self.eval_bar_y,
+                                               self.eval_bar_width, self.eval_bar_height)
+        self.eval_bar_centerline = pygame.Rect(self.eval_bar_x,
+                                               self.eval_bar_y + self.eval_bar_height // 2 - 1,
+                                               self.eval_bar_width, 2)
+        # Screen area touched by draw_eval_bar, including the overhanging text label
+        self.eval_bar_rect = pygame.Rect(self.eval_bar_x - 15, self.eval_bar_y,
+                                         self.eval_bar_width + 30, self.eval_bar_height)
+        
+        # Set whenever something other than the eval bar needs redrawing
+        self.dirty = True
         
         # Initialize board and game state
         self.board = chess.Board()
         self.selected_square = None
-        self.valid_moves = []
+        # Selected piece's legal moves keyed by target square
+        self.valid_moves = {}
+        # Legal moves grouped by from-square, for the position in legal_moves_key
+        self.legal_moves_key = None
+        self.legal_moves_by_square = {}
         self.player_color = chess.WHITE
         self.ai_thinking = False
+        # The engine searches on its own thread so the window keeps
+        # responding; ai_future holds the pending search and the position
+        # (transposition key) it was started from
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.ai_future = None
+        self.ai_future_key = None
         
         # Animation and timing control
         self.last_move_time = time.time()
@@ -123,15 +177,48 @@ class ChessGUI:
         self.WHITE_EVAL = (255, 255, 255)
         self.BLACK_EVAL = (0, 0, 0)
         
+        # The checkerboard never changes, so render it once in the display's
+        # pixel format and blit it as a single surface every frame
+        # (one fill for the light squares, then only the 32 dark ones)
+        self.board_surface = pygame.Surface((self.board_size, self.board_size)).convert()
+        self.board_surface.fill(self.LIGHT_SQUARE)
+        for row in range(8):
+            for col in range(1 - row % 2, 8, 2):
+                self.board_surface.fill(
+                    self.DARK_SQUARE,
+                    (col * self.square_size, row * self.square_size,
+                     self.square_size, self.square_size)
+                )
+        
+        # Translucent white wash shown over the board once the game has ended
+        self.game_over_overlay = pygame.Surface((self.width, self.height)).convert()
+        self.game_over_overlay.fill((255, 255, 255))
+        self.game_over_overlay.set_alpha(180)
+        
         # Game state
         self.game_over = False
         self.message = ""
         self.last_move = None
         self.game_saved = False
         
+        # Top-left pixel of every square, indexed by chess square
+        self.square_coords = [
+            (chess.square_file(square) * self.square_size,
+             (7 - chess.square_rank(square)) * self.square_size)
+            for square in chess.SQUARES
+        ]
+        
         # Load piece images
         self.pieces = {}
         self.load_pieces()
+        # (color, piece type, image) for every piece image that loaded, so
+        # draw_pieces can walk the board's piece bitboards directly
+        self.piece_layers = [
+            (color, piece_type, self.pieces[chess.Piece(piece_type, color).symbol()])
+            for color in chess.COLORS
+            for piece_type in chess.PIECE_TYPES
+            if chess.Piece(piece_type, color).symbol() in self.pieces
+        ]
 
     def load_pieces(self):
         piece_mapping = {
@@ -155,69 +242,70 @@ class ChessGUI:
             try:
                 image_path = os.path.join(image_directory, f"{filename_prefix}.png")
                 print(f"Loading image: {image_path}")
+                # Convert to the display format once so blits skip per-pixel conversion
                 self.pieces[chess_symbol] = pygame.transform.scale(
                     pygame.image.load(image_path),
                     (self.square_size, self.square_size)
-                )
+                ).convert_alpha()
             except pygame.error as e:
                 print(f"Error loading piece image {image_path}: {e}")
             except Exception as e:
                 print(f"Unexpected error loading {image_path}: {e}")
 
     def draw_board(self):
-        for row in range(8):
-            for col in range(8):
-                color = self.LIGHT_SQUARE if (row + col) % 2 == 0 else self.DARK_SQUARE
-                pygame.draw.rect(
-                    self.screen,
-                    color,
-                    (col * self.square_size, row * self.square_size, 
-                     self.square_size, self.square_size)
-                )
+        self.screen.blit(self.board_surface, (0, 0))
+
+    def render_text(self, text, color=(0, 0, 0), font=None):
+        """Render text antialiased, reusing the surface if it was drawn before."""
+        font = font or self.font
+        key = (text, color, font)
+        surface = self.text_cache.get(key)
+        if surface is None:
+            # Move lists and status lines keep changing; don't let them pile up
+            if len(self.text_cache) >= 512:
+                self.text_cache.clear()
+            # Cached surfaces are blitted many times, so match the display format
+            surface = self.text_cache[key] = font.render(text, True, color).convert_alpha()
+        return surface
 
     def draw_pieces(self):
-        for square in chess.SQUARES:
-            piece = self.board.piece_at(square)
-            if piece:
-                x = chess.square_file(square) * self.square_size
-                y = (7 - chess.square_rank(square)) * self.square_size
-                piece_symbol = piece.symbol()
-                if piece_symbol in self.pieces:
-                    self.screen.blit(self.pieces[piece_symbol], (x, y))
+        # Collect every piece and hand them to pygame in one blits() call.
+        # Scanning the twelve piece bitboards skips the per-square piece
+        # lookups (and Piece objects) that piece_map() builds
+        pieces_mask = self.board.pieces_mask
+        square_coords = self.square_coords
+        blit_sequence = [
+            (piece_image, square_coords[square])
+            for color, piece_type, piece_image in self.piece_layers
+            for square in chess.scan_forward(pieces_mask(piece_type, color))
+        ]
+        if self.has_fblits:
+            self.screen.fblits(blit_sequence)
+        else:
+            self.screen.blits(blit_sequence, doreturn=False)
 
     def draw_highlights(self):
         if self.selected_square is not None:
-            file = chess.square_file(self.selected_square)
-            rank = 7 - chess.square_rank(self.selected_square)
-            pygame.draw.rect(
-                self.screen,
-                self.HIGHLIGHT,
-                (file * self.square_size, rank * self.square_size,
-                 self.square_size, self.square_size)
-            )
+            size = self.square_size
+            x, y = self.square_coords[self.selected_square]
+            # Solid axis-aligned rects go through Surface.fill, not pygame.draw
+            self.screen.fill(self.HIGHLIGHT, (x, y, size, size))
             
-            for move in self.valid_moves:
-                if move.from_square == self.selected_square:
-                    file = chess.square_file(move.to_square)
-                    rank = 7 - chess.square_rank(move.to_square)
-                    pygame.draw.circle(
-                        self.screen,
-                        self.MOVE_HINT,
-                        (file * self.square_size + self.square_size // 2,
-                         rank * self.square_size + self.square_size // 2),
-                        self.square_size // 6
-                    )
+            half = size // 2
+            radius = size // 6
+            for target in self.valid_moves:
+                x, y = self.square_coords[target]
+                pygame.draw.circle(self.screen, self.MOVE_HINT, (x + half, y + half), radius)
 
     def draw_eval_bar(self):
         # Draw background
-        pygame.draw.rect(
-            self.screen,
-            (128, 128, 128),
-            (self.eval_bar_x, self.eval_bar_y, self.eval_bar_width, self.eval_bar_height)
-        )
+        self.screen.fill((128, 128, 128), self.eval_bar_background)
 
-        # Smooth out the evaluation change
+        # Smooth out the evaluation change, snapping once it is within half a
+        # centipawn so the bar settles and draw() stops repainting it
         self.smooth_eval = self.smooth_eval * 0.9 + self.current_eval * 0.1
+        if abs(self.smooth_eval - self.current_eval) <= 0.5:
+            self.smooth_eval = self.current_eval
 
         # Calculate the height of the white portion
         eval_value = self.smooth_eval
@@ -225,11 +313,10 @@ class ChessGUI:
         eval_percentage = 50 + (eval_value / max_eval) * 50
         eval_percentage = max(0, min(100, eval_percentage))
         
-        white_height = (eval_percentage / 100) * self.eval_bar_height
+        white_height = int((eval_percentage / 100) * self.eval_bar_height)
         
         # Draw white's portion (from bottom)
-        pygame.draw.rect(
-            self.screen,
+        self.screen.fill(
             self.WHITE_EVAL,
             (self.eval_bar_x, 
              self.eval_bar_y + self.eval_bar_height - white_height,
@@ -238,106 +325,87 @@ class ChessGUI:
         )
 
         # Draw centerline
-        pygame.draw.line(
-            self.screen,
-            (128, 128, 128),
-            (self.eval_bar_x, self.eval_bar_y + self.eval_bar_height // 2),
-            (self.eval_bar_x + self.eval_bar_width, self.eval_bar_y + self.eval_bar_height // 2),
-            2
-        )
+        self.screen.fill((128, 128, 128), self.eval_bar_centerline)
 
         # Draw evaluation text
-        font = pygame.font.SysFont('Arial', 14)
         eval_text = f"{self.smooth_eval/100:+.2f}" if abs(self.smooth_eval) < float('inf') else "M8"
-        text = font.render(eval_text, True, (0, 0, 0))
+        if eval_text != self.eval_label_text:
+            self.eval_label = self.font_small.render(eval_text, True, (0, 0, 0)).convert_alpha()
+            self.eval_label_text = eval_text
+        text = self.eval_label
         text_rect = text.get_rect(center=(self.eval_bar_x + self.eval_bar_width // 2, 
                                         self.height // 2))
         
         # Draw text background
-        pygame.draw.rect(
-            self.screen,
-            (255, 255, 255),
-            text_rect.inflate(10, 4)
-        )
+        self.screen.fill((255, 255, 255), text_rect.inflate(10, 4))
         self.screen.blit(text, text_rect)
 
-    def update_evaluation(self):
+    def eval_delta(self, move):
+        """Eval change for move from the current position, or None if current_eval is stale."""
+        if self.eval_key != self.board._transposition_key():
+            return None
+        return evaluate_delta(self.board, move)
+
+    def update_evaluation(self, delta=None):
         if not self.game_over:
-            self.current_eval = evaluate_board(self.board)
+            if delta is not None:
+                # Only the squares the move touched were rescored
+                self.current_eval += delta
+            else:
+                # Shares the engine's position-keyed cache, so revisited positions
+                # (history navigation, repetitions) and ones the search saw are free
+                self.current_eval = cached_evaluate(self.board)
+            self.eval_key = self.board._transposition_key()
 
     def draw_game_over(self):
         if self.game_over:
-            font = pygame.font.SysFont('Arial', 32)
-            text = font.render(self.message, True, (0, 0, 0))
+            text = self.render_text(self.message, font=self.font_large)
             text_rect = text.get_rect(center=(self.width/2, self.height/2))
             
-            overlay = pygame.Surface((self.width, self.height))
-            overlay.fill((255, 255, 255))
-            overlay.set_alpha(180)
-            self.screen.blit(overlay, (0, 0))
+            self.screen.blit(self.game_over_overlay, (0, 0))
             
             self.screen.blit(text, text_rect)
 
     def draw_last_move(self):
         if self.last_move:
-            file_from = chess.square_file(self.last_move.from_square)
-            rank_from = 7 - chess.square_rank(self.last_move.from_square)
-            pygame.draw.rect(
-                self.screen,
-                (255, 255, 0, 128),
-                (file_from * self.square_size, rank_from * self.square_size,
-                 self.square_size, self.square_size),
-                3
-            )
-            
-            file_to = chess.square_file(self.last_move.to_square)
-            rank_to = 7 - chess.square_rank(self.last_move.to_square)
-            pygame.draw.rect(
-                self.screen,
-                (255, 255, 0, 128),
-                (file_to * self.square_size, rank_to * self.square_size,
-                 self.square_size, self.square_size),
-                3
-            )
+            size = self.square_size
+            for square in (self.last_move.from_square, self.last_move.to_square):
+                x, y = self.square_coords[square]
+                pygame.draw.rect(self.screen, (255, 255, 0, 128), (x, y, size, size), 3)
 
     def get_square_from_pos(self, pos):
+        """Square under a screen position, or None outside the board."""
         x, y = pos
-        file = x // self.square_size
-        rank = 7 - (y // self.square_size)
-        return chess.square(file, rank)
+        if not (0 <= x < self.board_size and 0 <= y < self.board_size):
+            return None
+        return chess.square(x // self.square_size, 7 - y // self.square_size)
     
     def draw_pgn_controls(self):
         """Draw PGN control buttons and move history."""
-        # Draw buttons
-        for button, text in [
-            (self.save_button, "Save PGN"),
-            (self.load_button, "Load PGN"),
-            (self.prev_button, "← Previous"),
-            (self.next_button, "Next →")
-        ]:
-            pygame.draw.rect(self.screen, (200, 200, 200), button)
-            text_surf = self.font.render(text, True, (0, 0, 0))
-            text_rect = text_surf.get_rect(center=button.center)
-            self.screen.blit(text_surf, text_rect)
+        self.draw_buttons()
         
         # Draw move history
         history_x = self.board_size + 200
         history_y = 600
         spacing = 20
         
-        title = self.font.render("Move History:", True, (0, 0, 0))
-        self.screen.blit(title, (history_x, history_y))
+        self.screen.blit(self.history_title, (history_x, history_y))
         
         # Display last 10 moves
         start_idx = max(0, len(self.move_history) - 10)
         for i, move in enumerate(self.move_history[start_idx:]):
             move_text = f"{start_idx + i + 1}. {move}"
             color = (0, 128, 0) if i + start_idx == self.current_move_index else (0, 0, 0)
-            text = self.font.render(move_text, True, color)
+            text = self.render_text(move_text, color)
             self.screen.blit(text, (history_x, history_y + spacing * (i + 1)))
     
+    def draw_buttons(self):
+        for button, text_surf, text_rect in self.button_labels:
+            self.screen.fill((200, 200, 200), button)
+            self.screen.blit(text_surf, text_rect)
+    
     def handle_pgn_button_click(self, pos):
-        """Handle clicks on PGN control buttons."""
+        """Handle clicks on PGN control buttons; returns True if a button was hit."""
         if self.save_button.collidepoint(pos):
             filepath = self.pgn_handler.save_game(self.board, {
                 "White": "Human" if self.player_color == chess.WHITE else "Engine",
@@ -358,38 +426,65 @@ class ChessGUI:
             
         elif self.next_button.collidepoint(pos):
             self.navigate_moves(1)
+            
+        else:
+            return False
+        return True
     
     def load_game(self, game: chess.pgn.Game):
         """Load a PGN game."""
+        self.dirty = True
         self.board = game.board()
         self.move_history = []
         self.current_move_index = 0
         
         for move in game.mainline_moves():
-            self.move_history.append(str(move))
+            self.move_history.append(move)
             self.board.push(move)
             self.current_move_index += 1
+        
+        # The position jumped, so rescore it in full
+        self.update_evaluation()
     
     def navigate_moves(self, direction: int):
         """Navigate through move history."""
         target_index = self.current_move_index + direction
         
         if 0 <= target_index <= len(self.move_history):
-            # Reset board to starting position
-            self.board = chess.Board()
-            self.current_move_index = 0
+            self.dirty = True
+            # Take back any moves played on top of the history position
+            while len(self.board.move_stack) > self.current_move_index:
+                self.board.pop()
             
-            # Replay moves up to target index
-            for i in range(target_index):
-                move = chess.Move.from_uci(self.move_history[i])
-                self.board.push(move)
-                self.current_move_index = i + 1
+            # Step only across the moves between the two positions
+            while self.current_move_index < target_index:
+                self.board.push(self.move_history[self.current_move_index])
+                self.current_move_index += 1
+            while self.current_move_index > target_index:
+                self.board.pop()
+                self.current_move_index -= 1
+            
+            self.update_evaluation()
+
+    def legal_moves_from(self, square):
+        """Legal moves of the piece on square keyed by target square, generated once per position."""
+        key = self.board._transposition_key()
+        if key != self.legal_moves_key:
+            self.legal_moves_by_square = {}
+            for move in self.board.legal_moves:
+                # Pawns always promote to a queen, so one move per target square
+                if move.promotion in (None, chess.QUEEN):
+                    self.legal_moves_by_square.setdefault(move.from_square, {})[move.to_square] = move
+            self.legal_moves_key = key
+        return self.legal_moves_by_square.get(square, {})
 
     def handle_click(self, pos):
         """Handle mouse clicks."""
         # Handle PGN button clicks
         if self.handle_pgn_button_click(pos):
+            self.dirty = True
             return
+        # Ignored clicks change nothing on screen, so they don't force a redraw
         if self.game_over or self.ai_thinking or self.board.turn != self.player_color:
             return
 
@@ -398,24 +493,24 @@ class ChessGUI:
             return
 
         square = self.get_square_from_pos(pos)
+        if square is None:
+            return
+        
+        # From here the click can change the selection or the position
+        self.dirty = True
         
         if self.selected_square is not None:
-            move = chess.Move(self.selected_square, square)
-            if any(m.from_square == self.selected_square and m.to_square == square 
-                  for m in self.valid_moves):
-                if (self.board.piece_at(self.selected_square).piece_type == chess.PAWN and
-                    ((self.player_color == chess.WHITE and chess.square_rank(square) == 7) or
-                     (self.player_color == chess.BLACK and chess.square_rank(square) == 0))):
-                    move = chess.Move(self.selected_square, square, chess.QUEEN)
-                
+            move = self.valid_moves.get(square)
+            if move is not None:
+                delta = self.eval_delta(move)
                 self.board.push(move)
                 self.last_move = move
                 self.last_move_time = current_time
                 self.selected_square = None
-                self.valid_moves = []
+                self.valid_moves = {}
                 
                 # Update evaluation after player move
-                self.update_evaluation()
+                self.update_evaluation(delta)
                 
                 if self.board.is_game_over():
                     self.game_over = True
@@ -424,56 +519,67 @@ class ChessGUI:
                     self.ai_thinking = True
             else:
                 self.selected_square = None
-                self.valid_moves = []
+                self.valid_moves = {}
         else:
             piece = self.board.piece_at(square)
             if piece and piece.color == self.player_color:
                 self.selected_square = square
-                self.valid_moves = list(self.board.legal_moves)
+                self.valid_moves = self.legal_moves_from(square)
+
+    @staticmethod
+    def search(board):
+        """Runs on the executor thread; returns the move and whether it came from the book."""
+        move = next_move(3, board)
+        return move, debug_info.get("book_move", False)
 
     def make_ai_move(self):
         if self.ai_thinking and not self.game_over:
-            current_time = time.time()
-            if current_time - self.last_move_time < self.move_delay:
+            if self.ai_future is None:
+                if time.time() - self.last_move_time < self.move_delay:
+                    return
+                # Search a copy; the GUI keeps drawing self.board meanwhile
+                self.ai_future = self.executor.submit(self.search, self.board.copy())
+                self.ai_future_key = self.board._transposition_key()
+                return
+            if not self.ai_future.done():
                 return
-            # Get debug info before the move to check if it's a book move
-            debug_info.clear()
-            move = next_move(3, self.board)
-            # Check if it was a book move
-            self.last_move_from_book = debug_info.get("book_move", False)
+            
+            future, self.ai_future = self.ai_future, None
+            if self.ai_future_key != self.board._transposition_key():
+                # The position changed while searching (e.g. a game was
+                # loaded), so the result is for another board. Search again
+                # only if it is still the engine's turn
+                if self.board.turn == self.player_color or self.board.is_game_over():
+                    self.ai_thinking = False
+                return
+            move, self.last_move_from_book = future.result()
+            delta = self.eval_delta(move)
             self.board.push(move)
             self.last_move = move
-            self.last_move_time = current_time
+            self.last_move_time = time.time()
             self.ai_thinking = False
+            self.dirty = True
             
             # Update evaluation after AI move
-            self.update_evaluation()
+            self.update_evaluation(delta)
             
             if self.board.is_game_over():
                 self.game_over = True
                 self.message = self.get_game_over_message()
 
     def get_game_over_message(self):
-        result = None
-        if self.board.is_checkmate():
-            winner = "Black" if self.board.turn == chess.WHITE else "White"
-            result = "0-1" if winner == "Black" else "1-0"
-            message = f"{winner} wins by checkmate!"
-        elif self.board.is_stalemate():
-            result = "1/2-1/2"
-            message = "Game drawn by stalemate"
-        elif self.board.is_insufficient_material():
-            result = "1/2-1/2"
-            message = "Game drawn by insufficient material"
-        elif self.board.is_fifty_moves():
-            result = "1/2-1/2"
-            message = "Game drawn by fifty-move rule"
-        elif self.board.is_repetition():
-            result = "1/2-1/2"
-            message = "Game drawn by repetition"
-        else:
+        # One pass over every end condition, claimable draws included
+        outcome = self.board.outcome(claim_draw=True)
+        if outcome is None:
             result = "*"
             message = "Game Over"
+        else:
+            result = outcome.result()
+            if outcome.termination == chess.Termination.CHECKMATE:
+                winner = "White" if outcome.winner == chess.WHITE else "Black"
+                message = f"{winner} wins by checkmate!"
+            else:
+                message = DRAW_MESSAGES.get(outcome.termination, "Game Over")
         
         # Save the game if it hasn't been saved yet
         if not self.game_saved:
@@ -498,12 +604,12 @@ class ChessGUI:
 
         # Draw move number
         move_text = f"Move: {len(self.board.move_stack) // 2 + 1}"
-        text = self.font.render(move_text, True, (0, 0, 0))
+        text = self.render_text(move_text)
         self.screen.blit(text, (info_x, info_y))
         
         # Draw turn indicator
         turn_text = "White to move" if self.board.turn else "Black to move"
-        text = self.font.render(turn_text, True, (0, 0, 0))
+        text = self.render_text(turn_text)
         self.screen.blit(text, (info_x, info_y + spacing))
         
         # Draw last move info with book move indicator
@@ -512,10 +618,25 @@ class ChessGUI:
             last_move_text = f"Last move: {self.last_move}{move_source}"
             # Use a different color for book moves
             text_color = (0, 128, 0) if self.last_move_from_book else (0, 0, 0)
-            text = self.font.render(last_move_text, True, text_color)
+            text = self.render_text(last_move_text, text_color)
             self.screen.blit(text, (info_x, info_y + spacing * 2))
     
+    def needs_redraw(self):
+        """True while there is something to draw or an AI move is pending."""
+        return (self.dirty or self.ai_thinking
+                or (not self.game_over and self.smooth_eval != self.current_eval))
+
     def draw(self):
+        if not self.dirty:
+            # Only the eval bar can change on its own while it eases towards
+            # the new evaluation; push just that area to the display
+            if not self.game_over and abs(self.current_eval - self.smooth_eval) > 0.5:
+                self.draw_eval_bar()
+                self.draw_buttons()
+                pygame.display.update([self.eval_bar_rect, self.button_area])
+            return
+        
+        self.dirty = False
         self.draw_board()
         self.draw_last_move()
         self.draw_highlights()
@@ -535,17 +656,28 @@ def main():
     gui.update_evaluation()
 
     while running:
-        for event in pygame.event.get():
+        if gui.needs_redraw():
+            clock.tick(gui.animation_speed)
+            events = pygame.event.get()
+        else:
+            # Nothing to animate or move: sleep until input arrives
+            events = [pygame.event.wait(500)] + pygame.event.get()
+        
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # Left click
                     gui.handle_click(event.pos)
+            elif event.type == pygame.VIDEOEXPOSE:
+                # Window uncovered; repaint everything
+                gui.dirty = True
 
         gui.make_ai_move()
         gui.draw()
-        clock.tick(gui.animation_speed)
 
+    # Don't start a search that would only be thrown away
+    gui.executor.shutdown(wait=False, cancel_futures=True)
     pygame.quit()
 
 if __name__ == "__main__":
@@ -9,6 +9,28 @@ from datetime import datetime
 import logging
 from typing import List, Dict, Optional, Union
 import concurrent.futures
+import bisect
+
+def time_next_move(fen: str, depth: int) -> tuple:
+    """
+    Time a single next_move call on a position.
+    
+    Kept at module level so ProcessPoolExecutor can pickle it.
+    
+    Returns:
+        Tuple of (seconds taken, move in UCI)
+    """
+    return time_search(chess.Board(fen), depth)
+
+def time_search(board: chess.Board, depth: int) -> tuple:
+    """Like time_next_move, on a board that is already set up (and left unchanged)."""
+    start_time = time.perf_counter()
+    move = next_move(depth, board)
+    end_time = time.perf_counter()
+    
+    if move is None:
+        raise ValueError("Engine returned None move")
+    return end_time - start_time, str(move)
 
 class ELOTester:
     def __init__(self, depth: int = 3, iterations: int = 10, use_multiprocessing: bool = True):
@@ -51,6 +73,10 @@ class ELOTester:
             2200: 3.5,    # 3.5 seconds for 2200 ELO
             2500: 4.0     # 4 seconds for 2500 ELO
         }
+        # Reference points ordered by time, for bisecting in estimate_elo_from_time
+        ordered_points = sorted(self.reference_points.items(), key=lambda point: point[1])
+        self.reference_times = [t for _, t in ordered_points]
+        self.reference_elos = [elo for elo, _ in ordered_points]
         
         self.depth = depth
         self.iterations = iterations
@@ -69,29 +95,32 @@ class ELOTester:
         """
         Test engine's performance on a single position with error handling.
         """
+        return self.summarize_times(fen, *self.time_position(fen))
+
+    def time_position(self, fen: str) -> tuple:
+        """Run next_move self.iterations times on fen; returns (times, moves) of the runs that succeeded."""
         if not self.validate_fen(fen):
             raise ValueError(f"Invalid FEN string: {fen}")
             
+        # next_move pushes and pops its search moves, so one board serves every run
         board = chess.Board(fen)
         times = []
         moves = []
         
         for _ in range(self.iterations):
             try:
-                start_time = time.perf_counter()
-                move = next_move(self.depth, board)
-                end_time = time.perf_counter()
-                
-                if move is None:
-                    raise ValueError("Engine returned None move")
-                    
-                times.append(end_time - start_time)
-                moves.append(str(move))
+                elapsed, move = time_search(board, self.depth)
+                times.append(elapsed)
+                moves.append(move)
                 
             except Exception as e:
                 self.logger.error(f"Error testing position {fen}: {str(e)}")
                 continue
         
+        return times, moves
+
+    def summarize_times(self, fen: str, times: List[float], moves: List[str]) -> Dict[str, Union[float, List[str]]]:
+        """Timing statistics for one position from its individual runs."""
         if not times:
             raise RuntimeError(f"All attempts failed for position: {fen}")
             
@@ -105,20 +134,18 @@ class ELOTester:
 
     def estimate_elo_from_time(self, solving_time: float) -> float:
         """Estimate ELO based on solving time using enhanced interpolation."""
-        times = sorted(self.reference_points.values())
-        elos = [k for k, v in self.reference_points.items()]  # Fix: Get ELOs directly
+        times = self.reference_times
+        elos = self.reference_elos
         
         if solving_time <= times[0]:
             return elos[0]
         if solving_time >= times[-1]:
             return elos[-1]
-            
-        for i in range(len(times) - 1):
-            if times[i] <= solving_time <= times[i + 1]:
-                time_ratio = (solving_time - times[i]) / (times[i + 1] - times[i])
-                return elos[i] + time_ratio * (elos[i + 1] - elos[i])
         
-        return elos[-1]
+        # times[i - 1] < solving_time <= times[i]
+        i = bisect.bisect_left(times, solving_time)
+        time_ratio = (solving_time - times[i - 1]) / (times[i] - times[i - 1])
+        return elos[i - 1] + time_ratio * (elos[i] - elos[i - 1])
 
     def save_results(self, filename: Optional[str] = None) -> None:
         """Save test results to both text and JSON formats."""
@@ -176,14 +203,60 @@ class ELOTester:
             json.dump(json_results, f, indent=2)
 
     def process_position(self, fen: str) -> Optional[Dict]:
-        """Process a single position and return results. This is a separate method for multiprocessing."""
+        """Time a single position in this process and return its results (sequential mode)."""
+        try:
+            times, moves = self.time_position(fen)
+        except Exception as e:
+            self.logger.error(f"Failed to test position {fen}: {str(e)}")
+            return None
+        return self.rate_position(fen, times, moves)
+
+    def rate_position(self, fen: str, times: List[float], moves: List[str]) -> Optional[Dict]:
+        """Timing statistics plus estimated ELO for one position, or None if every run failed."""
         try:
-            result = self.test_single_position(fen)
-            elo = self.estimate_elo_from_time(result['avg_time'])
-            return {**result, 'elo': elo}
+            result = self.summarize_times(fen, times, moves)
         except Exception as e:
             self.logger.error(f"Failed to test position {fen}: {str(e)}")
             return None
+        return {**result, 'elo': self.estimate_elo_from_time(result['avg_time'])}
+
+    def run_parallel(self) -> List[Dict]:
+        """
+        Time every (position, iteration) pair in its own task rather than one
+        task per position, so all cores stay busy until the last run finishes.
+        
+        Only half the logical CPUs get a worker, so simultaneous runs don't
+        share a core (or its SMT sibling) and slow each other down. The times
+        are still not directly comparable to sequential mode: each worker
+        keeps its transposition table and eval cache between tasks, so how
+        warm a run starts depends on what that worker searched before. Use
+        --no-parallel when the ELO estimate has to match earlier sequential runs.
+        """
+        results = []
+        max_workers = max(1, (os.cpu_count() or 1) // 2)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            submitted = []
+            for fen in self.test_positions:
+                if not self.validate_fen(fen):
+                    self.logger.error(f"Failed to test position {fen}: Invalid FEN string: {fen}")
+                    continue
+                submitted.append((fen, [executor.submit(time_next_move, fen, self.depth)
+                                        for _ in range(self.iterations)]))
+            
+            for fen, futures in submitted:
+                times = []
+                moves = []
+                for future in futures:
+                    try:
+                        elapsed, move = future.result()
+                        times.append(elapsed)
+                        moves.append(move)
+                    except Exception as e:
+                        self.logger.error(f"Error testing position {fen}: {str(e)}")
+                result = self.rate_position(fen, times, moves)
+                if result:
+                    results.append(result)
+        return results
 
     def run_elo_test(self) -> float:
         """Run complete ELO testing with parallel processing support."""
@@ -191,9 +264,7 @@ class ELOTester:
         
         # Use parallel processing if enabled
         if self.use_multiprocessing:
-            with concurrent.futures.ProcessPoolExecutor() as executor:
-                futures = [executor.submit(self.process_position, fen) for fen in self.test_positions]
-                self.results = [f.result() for f in futures if f.result() is not None]
+            self.results = self.run_parallel()
         else:
             self.results = []
             for i, fen in enumerate(self.test_positions, 1):
@@ -229,7 +300,7 @@ def main():
     parser = argparse.ArgumentParser(description="Chess Engine ELO Testing Tool")
     parser.add_argument("--depth", type=int, default=3, help="Search depth for the engine")
     parser.add_argument("--iterations", type=int, default=10, help="Number of iterations per position")
-    parser.add_argument("--no-parallel", action="store_true", help="Disable parallel processing")
+    parser.add_argument("--no-parallel", action="store_true", help="Disable parallel processing (timings then match earlier sequential runs)")
     
     args = parser.parse_args()
     
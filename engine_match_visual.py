@@ -1,13 +1,12 @@
 import pygame
 import chess
 import chess.engine
-import chess.pgn
 import time
 import os
 from datetime import datetime
 from movegeneration import next_move, debug_info
 from evaluate import evaluate_board
-from pgn_handler import PGNHandler
+from pgn_handler import PGNHandler, format_pgn
 
 class GameSaver:
     def __init__(self, save_directory="engine_analysis/pgn_games"):  # Changed default directory
@@ -17,29 +16,25 @@ class GameSaver:
             os.makedirs(save_directory)
     
     def save_game(self, board, white_name="MyEngine", black_name="Stockfish", result=None, stockfish_elo=None):
-        game = chess.pgn.Game()
-        
-        game.headers["Event"] = "Training Game vs Stockfish"
-        game.headers["Site"] = "Local Computer"
-        game.headers["Date"] = datetime.now().strftime("%Y.%m.%d")
-        game.headers["Round"] = "1"
-        game.headers["White"] = white_name
-        game.headers["Black"] = black_name
-        game.headers["Result"] = result or "*"
+        headers = {}
+        
+        headers["Event"] = "Training Game vs Stockfish"
+        headers["Site"] = "Local Computer"
+        headers["Date"] = datetime.now().strftime("%Y.%m.%d")
+        headers["Round"] = "1"
+        headers["White"] = white_name
+        headers["Black"] = black_name
+        headers["Result"] = result or "*"
         if stockfish_elo:
-            game.headers["BlackElo"] = str(stockfish_elo)
-            game.headers["WhiteElo"] = "?"
-        
-        node = game
-        for move in board.move_stack:
-            node = node.add_variation(move)
+            headers["BlackElo"] = str(stockfish_elo)
+            headers["WhiteElo"] = "?"
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"game_{white_name}_vs_{black_name}{stockfish_elo}_{timestamp}.pgn"
         filepath = os.path.join(self.save_directory, filename)
         
         with open(filepath, "w") as f:
-            print(game, file=f, end="\n\n")
+            f.write(format_pgn(board, headers))
         
         return filepath
 
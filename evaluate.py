@@ -202,6 +202,18 @@ def evaluate_piece(piece: chess.Piece, square: chess.Square, end_game: bool) ->
 ##############################################################################################
 # Evaluates the board
 ##############################################################################################
+# Material plus piece-square value of every piece on every square, for both game
+# phases, so evaluate_board only adds up table entries for the occupied squares
+_square_values = {
+    (end_game, color, piece_type): [
+        piece_values[piece_type] + evaluate_piece(chess.Piece(piece_type, color), square, end_game)
+        for square in chess.SQUARES
+    ]
+    for end_game in (False, True)
+    for color in chess.COLORS
+    for piece_type in chess.PIECE_TYPES
+}
+
 def evaluate_board(board: chess.Board) -> float:
     """
     Evaluates the full board and determines which player is in a most favorable position.
@@ -213,16 +225,83 @@ def evaluate_board(board: chess.Board) -> float:
     total = 0
     end_game = check_end_game(board)
 
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if not piece:
-            continue
-
-        value = piece_values[piece.piece_type] + evaluate_piece(piece, square, end_game)
-        total += value if piece.color == chess.WHITE else -value
+    # Walk the piece bitboards instead of probing all 64 squares
+    for color in chess.COLORS:
+        side_total = 0
+        for piece_type in chess.PIECE_TYPES:
+            values = _square_values[end_game, color, piece_type]
+            for square in chess.scan_forward(board.pieces_mask(piece_type, color)):
+                side_total += values[square]
+        total += side_total if color == chess.WHITE else -side_total
 
     return total
 ##############################################################################################
+# Incremental evaluation
+##############################################################################################
+def evaluate_delta(board: chess.Board, move: chess.Move) -> float:
+    """
+    How much evaluate_board changes when move is played, without rescoring every square.
+    board is the position *before* the move. Only the squares the move touches are
+    rescored, plus both kings if a capture or promotion moves the game into (or out
+    of) the end game, since only the king tables depend on it.
+    """
+    piece = board.piece_at(move.from_square)
+    if piece is None:
+        raise Exception(f"A piece was expected at {move.from_square}")
+    color = piece.color
+
+    queens = chess.popcount(board.queens)
+    minors = chess.popcount(board.knights | board.bishops)
+    end_game = _is_end_game(queens, minors)
+
+    def score(p: chess.Piece, square: chess.Square, eg: bool) -> int:
+        value = piece_values[p.piece_type] + evaluate_piece(p, square, eg)
+        return value if p.color == chess.WHITE else -value
+
+    # Piece leaving the board
+    if board.is_en_passant(move):
+        captured_square = move.to_square + (-8 if color == chess.WHITE else 8)
+        captured = chess.Piece(chess.PAWN, not color)
+    else:
+        captured_square = move.to_square
+        captured = board.piece_at(move.to_square)
+
+    # Game phase after the move; it only changes on captures and promotions
+    if captured is not None:
+        queens -= captured.piece_type == chess.QUEEN
+        minors -= captured.piece_type in (chess.KNIGHT, chess.BISHOP)
+    if move.promotion is not None:
+        queens += move.promotion == chess.QUEEN
+        minors += move.promotion in (chess.KNIGHT, chess.BISHOP)
+    end_game_after = _is_end_game(queens, minors)
+
+    moved = chess.Piece(move.promotion, color) if move.promotion else piece
+    delta = score(moved, move.to_square, end_game_after) - score(piece, move.from_square, end_game)
+    if captured is not None:
+        delta -= score(captured, captured_square, end_game)
+
+    # The rook's half of a castling move
+    if board.is_castling(move):
+        rank = chess.square_rank(move.from_square)
+        if board.is_kingside_castling(move):
+            rook_from, rook_to = chess.square(7, rank), chess.square(5, rank)
+        else:
+            rook_from, rook_to = chess.square(0, rank), chess.square(3, rank)
+        rook = chess.Piece(chess.ROOK, color)
+        delta += score(rook, rook_to, end_game) - score(rook, rook_from, end_game)
+
+    # Kings that did not move but switch to the other king table
+    if end_game_after != end_game:
+        for king_color in chess.COLORS:
+            if king_color == color and piece.piece_type == chess.KING:
+                continue
+            king_square = board.king(king_color)
+            if king_square is not None:
+                king = chess.Piece(chess.KING, king_color)
+                delta += score(king, king_square, end_game_after) - score(king, king_square, end_game)
+
+    return delta
+##############################################################################################
 # End game check
 ##############################################################################################
 def check_end_game(board: chess.Board) -> bool:
@@ -232,20 +311,11 @@ def check_end_game(board: chess.Board) -> bool:
     - Both sides have no queens or
     - Every side which has a queen has additionally no other pieces or one minorpiece maximum.
     """
-    queens = 0
-    minors = 0
-
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece and piece.piece_type == chess.QUEEN:
-            queens += 1
-        if piece and (
-            piece.piece_type == chess.BISHOP or piece.piece_type == chess.KNIGHT
-        ):
-            minors += 1
-
-    if queens == 0 or (queens == 2 and minors <= 1):
-        return True
-
-    return False
+    # Count from the piece bitboards rather than probing all 64 squares
+    queens = chess.popcount(board.queens)
+    minors = chess.popcount(board.knights | board.bishops)
+    return _is_end_game(queens, minors)
+
+def _is_end_game(queens: int, minors: int) -> bool:
+    return queens == 0 or (queens == 2 and minors <= 1)
 ##############################################################################################
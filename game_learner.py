@@ -1,13 +1,19 @@
 import chess
 import chess.pgn
+import chess.polyglot
 import os
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Iterable
 from collections import defaultdict
 import json
 import time
 from dataclasses import dataclass
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Optional faster JSON backend
+    orjson = None
+
 @dataclass
 class PositionData:
     """Data stored for each position"""
@@ -31,23 +37,36 @@ class GameLearner:
         base_dir.mkdir(exist_ok=True)
         
         self.experience_file = experience_file
-        self.positions: Dict[str, List[PositionData]] = defaultdict(list)
+        self.positions: Dict[int, List[PositionData]] = defaultdict(list)
+        self._n_moves = 0  # Running total of stored moves, kept for get_statistics
         self.load_experience()
+
+    @staticmethod
+    def position_key(board: chess.Board) -> int:
+        """Zobrist hash identifying a position (pieces, turn, castling, en passant)."""
+        return chess.polyglot.zobrist_hash(board)
         
     def load_experience(self):
         """Load learned positions from file."""
         if os.path.exists(self.experience_file):
             try:
-                with open(self.experience_file, 'r') as f:
-                    data = json.load(f)
-                    for fen, moves in data.items():
-                        self.positions[fen] = [
+                with open(self.experience_file, 'rb') as f:
+                    data = orjson.loads(f.read()) if orjson else json.load(f)
+                    for key, moves in data.items():
+                        if key.isdigit():
+                            key = int(key)
+                        else:
+                            # Older files were keyed by the first four FEN fields
+                            key = self.position_key(chess.Board(f"{key} 0 1"))
+                        self.positions[key] = [
                             PositionData(**move_data) for move_data in moves
                         ]
+                        self._n_moves += len(moves)
                 print(f"Loaded {len(self.positions)} learned positions")
             except Exception as e:
                 print(f"Error loading experience file: {e}")
                 self.positions = defaultdict(list)
+                self._n_moves = 0
         else:
             # Create parent directory if it doesn't exist
             os.makedirs(os.path.dirname(self.experience_file), exist_ok=True)
@@ -57,108 +76,142 @@ class GameLearner:
         """Save learned positions to file."""
         try:
             data = {
-                fen: [vars(move_data) for move_data in moves]
-                for fen, moves in self.positions.items()
+                str(key): [vars(move_data) for move_data in moves]
+                for key, moves in self.positions.items()
             }
-            with open(self.experience_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            if orjson:
+                with open(self.experience_file, 'wb') as f:
+                    f.write(orjson.dumps(data))
+            else:
+                with open(self.experience_file, 'w') as f:
+                    json.dump(data, f)
             print(f"Saved {len(self.positions)} learned positions")
         except Exception as e:
             print(f"Error saving experience file: {e}")
 
-    def learn_from_game(self, pgn_file: str):
+    def learn_from_moves(self, moves: Iterable[chess.Move], result: str,
+                         board: Optional[chess.Board] = None):
+        """
+        Learn from one game given as its sequence of moves.
+        
+        Args:
+            moves: Moves played, in order
+            result: PGN result string ("1-0", "0-1", "1/2-1/2" or "*")
+            board: Starting position, defaults to the standard start
+        """
+        if board is None:
+            board = chess.Board()
+        
+        white_won = result == "1-0"
+        black_won = result == "0-1"
+    
+        for move in moves:
+            # Key the current position by its Zobrist hash
+            key = self.position_key(board)
+        
+            # Get move evaluation if available
+            eval_score = 0.0  # Default if no evaluation available
+        
+            # Update position data
+            move_str = move.uci()
+            move_data = None
+        
+            # Find or create move data
+            for existing_data in self.positions[key]:
+                if existing_data.move == move_str:
+                    move_data = existing_data
+                    break
+        
+            if move_data is None:
+                move_data = PositionData(
+                    move=move_str,
+                    num_times_played=0,
+                    win_score=0.0,
+                    avg_eval=0.0,
+                    is_book=False  # Will be updated if it was a book move
+                )
+                self.positions[key].append(move_data)
+                self._n_moves += 1
+        
+            # Update statistics
+            move_data.num_times_played += 1
+        
+            # Update win score
+            if white_won and board.turn == chess.WHITE:
+                move_data.win_score += 1
+            elif black_won and board.turn == chess.BLACK:
+                move_data.win_score += 1
+        
+            # Update average evaluation
+            move_data.avg_eval = (
+                (move_data.avg_eval * (move_data.num_times_played - 1) + eval_score)
+                / move_data.num_times_played
+            )
+        
+            # Make the move
+            board.push(move)
+
+    def learn_from_game(self, pgn_file: str) -> int:
         """
-        Learn from a single PGN game.
+        Learn from every game in a PGN file.
         
         Args:
             pgn_file: Path to PGN file to learn from
+            
+        Returns:
+            Number of games learned from
         """
+        num_games = 0
         try:
             with open(pgn_file) as f:
-                game = chess.pgn.read_game(f)
-                if game is None:
-                    return
+                while True:
+                    game = chess.pgn.read_game(f)
+                    if game is None:
+                        break
                 
-                # Get game result
-                result = game.headers.get("Result", "*")
-                white_won = result == "1-0"
-                black_won = result == "0-1"
+                    self.learn_from_moves(game.mainline_moves(),
+                                          game.headers.get("Result", "*"),
+                                          game.board())
                 
-                board = game.board()
-                for move in game.mainline_moves():
-                    # Get FEN for current position (excluding move counters)
-                    fen = " ".join(board.fen().split(" ")[:4])
-                    
-                    # Get move evaluation if available
-                    eval_score = 0.0  # Default if no evaluation available
-                    
-                    # Update position data
-                    move_str = move.uci()
-                    move_data = None
-                    
-                    # Find or create move data
-                    for existing_data in self.positions[fen]:
-                        if existing_data.move == move_str:
-                            move_data = existing_data
-                            break
-                    
-                    if move_data is None:
-                        move_data = PositionData(
-                            move=move_str,
-                            num_times_played=0,
-                            win_score=0.0,
-                            avg_eval=0.0,
-                            is_book=False  # Will be updated if it was a book move
-                        )
-                        self.positions[fen].append(move_data)
-                    
-                    # Update statistics
-                    move_data.num_times_played += 1
-                    
-                    # Update win score
-                    if white_won and board.turn == chess.WHITE:
-                        move_data.win_score += 1
-                    elif black_won and board.turn == chess.BLACK:
-                        move_data.win_score += 1
-                    
-                    # Update average evaluation
-                    move_data.avg_eval = (
-                        (move_data.avg_eval * (move_data.num_times_played - 1) + eval_score)
-                        / move_data.num_times_played
-                    )
-                    
-                    # Make the move
-                    board.push(move)
-                
-                print(f"Learned from game: {game.headers.get('White', '?')} vs {game.headers.get('Black', '?')}")
+                    num_games += 1
+                    print(f"Learned from game: {game.headers.get('White', '?')} vs {game.headers.get('Black', '?')}")
                 
         except Exception as e:
             print(f"Error learning from game {pgn_file}: {e}")
+        
+        return num_games
 
-    def learn_from_directory(self, directory: str = "engine_analysis/pgn_games"):
+    def learn_from_files(self, pgn_files: Iterable[str]):
         """
-        Learn from all PGN files in a directory.
+        Learn from the given PGN files only.
         
         Args:
-            directory: Directory containing PGN files, defaults to engine_analysis/pgn_games
+            pgn_files: Paths of the PGN files to learn from
         """
         start_time = time.time()
         num_games = 0
         
+        for pgn_file in pgn_files:
+            num_games += self.learn_from_game(str(pgn_file))
+        
+        elapsed = time.time() - start_time
+        print(f"Learned from {num_games} games in {elapsed:.2f} seconds")
+
+    def learn_from_directory(self, directory: str = "engine_analysis/pgn_games"):
+        """
+        Learn from all PGN files in a directory.
+        
+        Args:
+            directory: Directory containing PGN files, defaults to engine_analysis/pgn_games
+        """
         # Ensure directory exists
         directory_path = Path(directory)
         if not directory_path.exists():
             print(f"Directory {directory} does not exist")
             return
             
-        for file in directory_path.glob('*.pgn'):
-            self.learn_from_game(str(file))
-            num_games += 1
-        
+        self.learn_from_files(directory_path.glob('*.pgn'))
         self.save_experience()
-        
-        elapsed = time.time() - start_time
-        print(f"Learned from {num_games} games in {elapsed:.2f} seconds")
 
     def get_move_suggestion(self, board: chess.Board) -> Optional[chess.Move]:
         """
@@ -170,8 +223,7 @@ class GameLearner:
         Returns:
             Suggested move or None if no learned moves available
         """
-        fen = " ".join(board.fen().split(" ")[:4])
-        moves = self.positions.get(fen, [])
+        moves = self.positions.get(self.position_key(board), [])
         
         if not moves:
             return None
@@ -196,17 +248,16 @@ class GameLearner:
         return None
     
     def get_statistics(self) -> dict:
-        """Get learning statistics."""
+        """Get learning statistics from the running counters (no full scan)."""
         total_positions = len(self.positions)
-        total_moves = 0
-        for position_data in self.positions.values():
-            total_moves += len(position_data)
+        total_moves = self._n_moves
     
         return {
             'total_positions': total_positions,
             'total_moves': total_moves,
             'average_moves_per_position': total_moves / total_positions if total_positions > 0 else 0,
-            'positions_learned': len([pos for pos in self.positions.values() if pos])
+            # Every stored position has at least one move
+            'positions_learned': total_positions
         }
 
     def get_position_stats(self, board: chess.Board) -> List[Dict]:
@@ -219,8 +270,7 @@ class GameLearner:
         Returns:
             List of move statistics
         """
-        fen = " ".join(board.fen().split(" ")[:4])
-        moves = self.positions.get(fen, [])
+        moves = self.positions.get(self.position_key(board), [])
         
         stats = []
         for move_data in moves:
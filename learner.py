@@ -73,9 +73,9 @@ class GameLearner:
                     board = game.board()
                     
                     for move in game.mainline_moves():
-                        # Convert position to FEN, excluding move numbers
-                        fen_parts = board.fen().split(' ')
-                        position_key = ' '.join(fen_parts[:4])
+                        # FEN without the move counters; EPD is exactly those
+                        # four fields, without building and re-joining the full FEN
+                        position_key = board.epd()
                         
                         # Store the move if it's not already stored for this position
                         move_uci = move.uci()
@@ -91,8 +91,7 @@ class GameLearner:
 
     def get_known_move(self, board):
         """Get a known move for a position if available."""
-        fen_parts = board.fen().split(' ')
-        position_key = ' '.join(fen_parts[:4])
+        position_key = board.epd()
         
         if position_key in self.positions:
             return self.positions[position_key]
@@ -2,6 +2,7 @@ from typing import Dict, List, Any
 import chess
 import sys
 import time
+import logging
 from evaluate import evaluate_board, move_value, check_end_game
 from opening_book import OpeningBook
 from transposition_table import TranspositionTable, NodeType
@@ -9,6 +10,8 @@ from game_learner import GameLearner
 
 debug_info: Dict[str, Any] = {}
 
+logger = logging.getLogger(__name__)
+
 MATE_SCORE = 1000000000
 MATE_THRESHOLD = 999000000
 
@@ -25,6 +28,59 @@ learner = GameLearner()
 # Initialize transposition table
 tt = TranspositionTable(32)  
 
+# Static evaluations keyed by position. evaluate_board only looks at the pieces
+# on the board, so entries never go stale; the cache is simply emptied when full
+eval_cache: Dict[tuple, float] = {}
+EVAL_CACHE_MAX = 1 << 16
+
+# Optional second level shared by all batch worker processes (see
+# attach_shared_eval_table). Each entry is two int64 slots, (tag ^ score, score),
+# so a torn write from another process simply reads back as a miss
+shared_eval_table = None
+shared_eval_mask = 0
+
+def attach_shared_eval_table(buffer) -> None:
+    """Back the local eval cache with a shared buffer of 2**k 16-byte entries."""
+    global shared_eval_table, shared_eval_mask
+    shared_eval_table = memoryview(buffer).cast('q')
+    shared_eval_mask = len(shared_eval_table) // 2 - 1
+
+def detach_shared_eval_table() -> None:
+    """Release the shared buffer so its owner can close it."""
+    global shared_eval_table, shared_eval_mask
+    if shared_eval_table is not None:
+        shared_eval_table.release()
+    shared_eval_table = None
+    shared_eval_mask = 0
+
+def cached_evaluate(board: chess.Board) -> float:
+    """evaluate_board with a cache keyed by the board's transposition key."""
+    key = board._transposition_key()
+    score = eval_cache.get(key)
+    if score is None:
+        table = shared_eval_table
+        if table is None:
+            score = evaluate_board(board)
+        else:
+            # hash() of a tuple of ints (and bools) is the same in every process,
+            # but hash(None) is address based, so a missing en passant square
+            # (the key's last field) is replaced by -1 before hashing
+            ep_square = key[-1]
+            h = hash(key[:-1] + (-1 if ep_square is None else ep_square,))
+            slot = (h & shared_eval_mask) * 2
+            # The tag is forced odd so an untouched (all zero) entry never matches;
+            # the slot comes from the raw hash so even entries are used as well
+            tag = h | 1
+            score = table[slot + 1]
+            if table[slot] ^ score != tag:
+                score = evaluate_board(board)
+                table[slot] = tag ^ score
+                table[slot + 1] = score
+        if len(eval_cache) >= EVAL_CACHE_MAX:
+            eval_cache.clear()
+        eval_cache[key] = score
+    return score
+
 def quiescence_search(board: chess.Board, alpha: float, beta: float, depth: int = 4) -> tuple[float, int]:
     """
     Quiescence search to evaluate only "quiet" positions.
@@ -39,7 +95,7 @@ def quiescence_search(board: chess.Board, alpha: float, beta: float, depth: int
         Tuple of (evaluation, nodes searched)
     """
     nodes = 1
-    stand_pat = evaluate_board(board)
+    stand_pat = cached_evaluate(board)
     
     # Return immediately if checkmate is found
     if board.is_checkmate():
@@ -104,7 +160,7 @@ def next_move(depth: int, board: chess.Board, debug=True, time_limit=10.0) -> ch
         move = minimax_root(depth, board)
     except TimeoutError:
         # If we timeout, return best move found so far
-        print("Search timed out - returning best move found")
+        logger.info("Search timed out - returning best move found")
         move = get_ordered_moves(board)[0]
     
     debug_info["time"] = time.time() - t0
@@ -133,10 +189,13 @@ def minimax(depth: int, board: chess.Board, alpha: float, beta: float,
 
     debug_info["nodes"] += 1
 
-    # Quick evaluation for terminal positions
-    if board.is_checkmate():
-        return -MATE_SCORE if is_maximising_player else MATE_SCORE
-    elif board.is_game_over():
+    # Quick evaluation for terminal positions. Same outcomes as
+    # is_checkmate() + is_game_over(), with a single legal-move probe
+    if not any(board.generate_legal_moves()):
+        if board.is_check():
+            return -MATE_SCORE if is_maximising_player else MATE_SCORE
+        return 0
+    if board.is_insufficient_material() or board.is_seventyfive_moves() or board.is_fivefold_repetition():
         return 0
         
     # Extend search in check
@@ -266,13 +325,16 @@ def minimax(depth: int, board: chess.Board, alpha: float, beta: float,
 
     debug_info["nodes"] += 1
 
-    if board.is_checkmate():
-        return -MATE_SCORE if is_maximising_player else MATE_SCORE
-    elif board.is_game_over():
+    # Checkmate or any other game end, with a single legal-move probe
+    if not any(board.generate_legal_moves()):
+        if board.is_check():
+            return -MATE_SCORE if is_maximising_player else MATE_SCORE
+        return 0
+    if board.is_insufficient_material() or board.is_seventyfive_moves() or board.is_fivefold_repetition():
         return 0
 
     if depth == 0:
-        score = evaluate_board(board)
+        score = cached_evaluate(board)
         tt.store(board, 0, score, NodeType.EXACT)
         return score
 
@@ -5,6 +5,58 @@ from datetime import datetime
 from typing import Optional, List, Dict, Any
 import io
 
+def format_pgn(board: chess.Board, headers: Dict[str, str]) -> str:
+    """
+    Build PGN text directly from the board's move stack.
+    
+    The moves were all played on the board, so there is no need for a
+    chess.pgn.Game tree; one SAN pass over the stack gives the movetext.
+    The output is laid out like chess.pgn's exporter: seven tag roster first,
+    escaped tag values and movetext wrapped at 80 columns.
+    
+    Args:
+        board: The chess board containing the game moves
+        headers: PGN headers, on top of the seven tag roster defaults
+        
+    Returns:
+        str: PGN text of the game, ending in a blank line
+    """
+    # Seven tag roster first, with the same defaults as chess.pgn.Game
+    tags = {"Event": "?", "Site": "?", "Date": "????.??.??", "Round": "?",
+            "White": "?", "Black": "?", "Result": "*"}
+    tags.update(headers)
+    
+    root = board.root()
+    if root.fen() != chess.STARTING_FEN:
+        tags["FEN"] = root.fen()
+        tags["SetUp"] = "1"
+    
+    lines = []
+    for key, value in tags.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        lines.append(f'[{key} "{value}"]')
+    lines.append("")
+    
+    # Move numbers and moves are separate tokens, as in chess.pgn
+    tokens = []
+    for i, move in enumerate(board.move_stack):
+        if root.turn == chess.WHITE:
+            tokens.append(f"{root.fullmove_number}.")
+        elif i == 0:
+            tokens.append(f"{root.fullmove_number}...")
+        tokens.append(root.san_and_push(move))
+    tokens.append(tags["Result"])
+    
+    line = ""
+    for token in tokens:
+        # chess.pgn counts each token with its trailing space
+        if line and len(line) + len(token) + 1 > 80:
+            lines.append(line.rstrip())
+            line = ""
+        line += token + " "
+    lines.append(line.rstrip())
+    return "\n".join(lines) + "\n\n"
+
 class PGNHandler:
     def __init__(self, directory="engine_analysis/pgn_games"):
         """
@@ -33,8 +85,6 @@ class PGNHandler:
         Returns:
             str: Path to the saved PGN file
         """
-        game = chess.pgn.Game()
-        
         # Set default headers
         default_headers = {
             "Event": "Chess Game",
@@ -50,15 +100,6 @@ class PGNHandler:
         if headers:
             default_headers.update(headers)
         
-        # Set all headers
-        for key, value in default_headers.items():
-            game.headers[key] = value
-        
-        # Add moves
-        node = game
-        for move in board.move_stack:
-            node = node.add_variation(move)
-        
         # Generate filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"game_{timestamp}.pgn"
@@ -66,7 +107,7 @@ class PGNHandler:
         
         # Save to file
         with open(filepath, "w") as f:
-            print(game, file=f, end="\n\n")
+            f.write(format_pgn(board, default_headers))
         
         return filepath
     
@@ -133,8 +174,6 @@ class PGNHandler:
         Returns:
             str: PGN string representation of the game
         """
-        game = chess.pgn.Game()
-        
         # Set headers
         default_headers = {
             "Event": "Chess Game",
@@ -144,16 +183,5 @@ class PGNHandler:
         
         if headers:
             default_headers.update(headers)
-            
-        for key, value in default_headers.items():
-            game.headers[key] = value
-        
-        # Add moves
-        node = game
-        for move in board.move_stack:
-            node = node.add_variation(move)
         
-        # Convert to string
-        output = io.StringIO()
-        print(game, file=output, end="\n\n")
-        return output.getvalue()
+        return format_pgn(board, default_headers)
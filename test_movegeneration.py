@@ -0,0 +1,56 @@
+import random
+import unittest
+
+import chess
+
+import movegeneration
+from movegeneration import attach_shared_eval_table, cached_evaluate, detach_shared_eval_table
+
+
+class SharedEvalTableTest(unittest.TestCase):
+    ENTRIES = 64
+
+    def setUp(self):
+        self.buffer = bytearray(self.ENTRIES * 16)
+        attach_shared_eval_table(self.buffer)
+        movegeneration.eval_cache.clear()
+
+    def tearDown(self):
+        detach_shared_eval_table()
+        movegeneration.eval_cache.clear()
+
+    def filled_entries(self):
+        table = memoryview(self.buffer).cast('q')
+        return {i for i in range(self.ENTRIES) if table[2 * i] or table[2 * i + 1]}
+
+    def test_even_entries_are_used(self):
+        # Random games give far more positions than the table has entries
+        rng = random.Random(0)
+        for _ in range(20):
+            board = chess.Board()
+            for _ in range(40):
+                cached_evaluate(board)
+                moves = list(board.legal_moves)
+                if not moves:
+                    break
+                board.push(rng.choice(moves))
+
+        filled = self.filled_entries()
+        self.assertTrue(any(i % 2 == 0 for i in filled))
+        self.assertTrue(any(i % 2 == 1 for i in filled))
+
+    def test_entries_are_reused_across_caches(self):
+        board = chess.Board("r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3")
+        expected = cached_evaluate(board)
+        # A fresh local cache, as in another worker process, reads the shared entry
+        movegeneration.eval_cache.clear()
+        original = movegeneration.evaluate_board
+        movegeneration.evaluate_board = lambda board: self.fail("shared entry was not used")
+        try:
+            self.assertEqual(cached_evaluate(board), expected)
+        finally:
+            movegeneration.evaluate_board = original
+
+
+if __name__ == "__main__":
+    unittest.main()